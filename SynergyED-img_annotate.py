@@ -6,11 +6,13 @@ brightness/contrast adjustment, and export capabilities.
 
 import sys
 import os
+import atexit
+import functools
+import multiprocessing as mp
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-
-import numpy as np
-from PIL import Image
+from typing import Optional, Set
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -18,8 +20,8 @@ from PyQt6.QtWidgets import (
     QGroupBox, QCheckBox, QMessageBox, QSpinBox, QDialog, QListWidget,
     QProgressDialog, QScrollArea
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPixmap, QImage, QAction, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, QEvent
+from PyQt6.QtGui import QPixmap, QAction, QColor, QFont
 from PyQt6.QtWidgets import QColorDialog, QFontDialog
 
 # Helpers
@@ -28,18 +30,41 @@ class SmartDoubleSpinBox(QDoubleSpinBox):
     non-integers with up to 2 decimals (without trailing zeros)."""
     def textFromValue(self, value: float) -> str:  # type: ignore[override]
         try:
-            if abs(value - round(value)) < 1e-9:
-                return str(int(round(value)))
-            # Show up to 2 decimals without trailing zeros
-            return (f"{value:.2f}").rstrip('0').rstrip('.')
+            if value.is_integer():
+                return str(int(value))
+            # Show up to 2 decimals without trailing zeros; with a fixed
+            # two-digit fraction only the last one or all three chars can go
+            s = f"{value:.2f}"
+            if s[-1] != '0':
+                return s
+            return s[:-3] if s[-2] == '0' else s[:-1]
         except Exception:
             return super().textFromValue(value)
 
+
+@functools.lru_cache(maxsize=16)
+def _preset_rgb(name: str) -> tuple:
+    """(r, g, b) of a named color preset ("white" or black otherwise)."""
+    return (255, 255, 255) if name == "white" else (0, 0, 0)
+
+
+def _preset_color(name: str) -> QColor:
+    """New QColor for a named color preset.
+
+    Only the immutable RGB tuple is cached: the renderer keeps the QColor
+    by reference, so a shared instance could be changed in place.
+    """
+    return QColor(*_preset_rgb(name))
+
 # Import our modules
 from core.image_processor import ImageProcessor
+from core import kernels, rod_image_reader
 from core.overlay_renderer import OverlayRenderer
+from core.image_writer import DEFAULT_PNG_COMPRESS_LEVEL, DEFAULT_JPEG_QUALITY
+from core.batch_annotator import BatchConfig, get_executor, shutdown_executor, annotate_one
 from utils.preset_manager import PresetManager, PresetStorage
 from gui.collapsible_box import QCollapsibleBox
+from gui.workers import LoadImageTask, SaveImageTask
 
 
 class TEMImageEditor(QMainWindow):
@@ -56,16 +81,44 @@ class TEMImageEditor(QMainWindow):
         
         # Current file and calibration
         self.current_file: Optional[str] = None
+        self._load_task: Optional[LoadImageTask] = None  # In-flight background load
+        self._file_info_before_load = ""
+        self._save_tasks: Set[SaveImageTask] = set()  # In-flight exports, kept alive until done
         self.nm_per_pixel = 1.0
         self.pixel_size_unit = "nm"
         
         # Load presets
         self.presets = PresetStorage.load_presets()
+        # Set when presets change in memory; written once on close instead
+        # of on every spinbox tick
+        self._presets_dirty = False
+        atexit.register(self._flush_presets)
+        
+        # Coalesce bursts of update requests (slider drags, spinbox ticks)
+        # into a single trailing repaint, capped at ~60 Hz
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self._do_update_display)
+        # Nesting depth of _batched() blocks; repaints are held while > 0
+        self._suspend_repaints = 0
+        
+        # Small LRU of rendered frames so toggling back to a previous state
+        # (checkbox A/B, undoing a slider move) skips the overlay render
+        self._render_cache: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self._render_cache_size = 8
+        # Frame currently on screen: (render key, label size, transformation mode, QPixmap)
+        self._scaled_cache: tuple = (None, None, None, None)
         
         # Setup UI
         self.setup_ui()
         self.setup_menu()
         
+        # JIT-compile the Numba kernels once the window is up, rather than
+        # stalling the first brightness/contrast drag or .rodhypix load
+        QTimer.singleShot(0, kernels.warmup)
+        QTimer.singleShot(0, rod_image_reader.warmup)
+        
     def setup_menu(self):
         """Setup the menu bar."""
         menubar = self.menuBar()
@@ -118,6 +171,8 @@ class TEMImageEditor(QMainWindow):
         self.image_label.setStyleSheet("QLabel { background-color: #2b2b2b; border: 2px solid #555; }")
         self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_label.setText("No image loaded")
+        # Resizes of the display area go through the repaint debounce
+        self.image_label.installEventFilter(self)
         
         image_layout.addWidget(self.image_label)
         
@@ -225,6 +280,7 @@ class TEMImageEditor(QMainWindow):
         self.min_slider.setRange(0, 255)
         self.min_slider.setValue(0)
         self.min_slider.valueChanged.connect(self.on_brightness_contrast_changed)
+        self.min_slider.sliderReleased.connect(self.update_display)
         self.min_value_label = QLabel("0")
         min_layout.addWidget(self.min_slider)
         min_layout.addWidget(self.min_value_label)
@@ -237,6 +293,7 @@ class TEMImageEditor(QMainWindow):
         self.max_slider.setRange(0, 255)
         self.max_slider.setValue(255)
         self.max_slider.valueChanged.connect(self.on_brightness_contrast_changed)
+        self.max_slider.sliderReleased.connect(self.update_display)
         self.max_value_label = QLabel("255")
         max_layout.addWidget(self.max_slider)
         max_layout.addWidget(self.max_value_label)
@@ -364,6 +421,7 @@ class TEMImageEditor(QMainWindow):
         self.bg_opacity_slider.setRange(0, 255)
         self.bg_opacity_slider.setValue(255)
         self.bg_opacity_slider.valueChanged.connect(self.on_bg_opacity_changed)
+        self.bg_opacity_slider.sliderReleased.connect(self.update_display)
         bg_controls_layout.addWidget(self.bg_opacity_slider)
         
         bg_layout.addLayout(bg_controls_layout)
@@ -412,26 +470,45 @@ class TEMImageEditor(QMainWindow):
     # Event handlers
     def load_image(self):
         """Load an image file."""
+        if self._load_task is not None:
+            # A load is already in flight; ignore further requests until it finishes
+            return
+        
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open Image", "",
             "Image Files (*.rodhypix *.tif *.tiff *.png *.jpg *.jpeg *.bmp);;RODHyPix Files (*.rodhypix);;TIFF Files (*.tif *.tiff);;All Files (*.*)"
         )
         
         if file_path:
-            success, error, dimensions, pixel_metadata = self.image_processor.load_image(file_path)
-            
-            if success:
+            # Decode on a worker thread so the window keeps repainting
+            self._load_task = LoadImageTask(file_path)
+            self._load_task.signals.finished.connect(self._on_image_loaded)
+            self._file_info_before_load = self.file_info_label.text()
+            self.file_info_label.setText(f"Loading {Path(file_path).name}...")
+            QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor)
+            QThreadPool.globalInstance().start(self._load_task)
+    
+    def _on_image_loaded(self, file_path: str, processor: ImageProcessor, result: tuple):
+        """Handle completion of a background image load."""
+        self._load_task = None
+        QApplication.restoreOverrideCursor()
+        success, error, dimensions, pixel_metadata = result
+        
+        if success:
+            # One repaint for the whole swap, not one per widget update
+            with self._batched():
+                self.image_processor = processor
                 self.current_file = file_path
                 width, height = dimensions
                 filename = Path(file_path).name
                 self.file_info_label.setText(f"File: {filename} | Size: {width}x{height}px")
-                
+            
                 # If we got pixel metadata from rodhypix file, automatically set the calibration
                 if pixel_metadata and 'pixel_size_nm' in pixel_metadata:
                     # Set the pixel size calibration automatically
                     nm_per_pixel = pixel_metadata['pixel_size_nm']
                     um_per_pixel = pixel_metadata['pixel_size_um']
-                    
+                
                     # Determine which unit is more appropriate (prefer nm for < 1 µm, µm for >= 1 µm)
                     if um_per_pixel >= 1.0:
                         self.nm_per_pixel = um_per_pixel
@@ -441,20 +518,20 @@ class TEMImageEditor(QMainWindow):
                         self.nm_per_pixel = nm_per_pixel
                         self.pixel_size_unit = "nm"
                         self.pixel_size_unit_combo.setCurrentText("nm")
-                    
+                
                     self._update_pixel_size_display()
-                    
+                
                     # Show a message to the user
                     info_text = f"Pixel size from file header: {nm_per_pixel:.1f} nm ({um_per_pixel:.3f} µm)"
                     print(info_text)
                     self.file_info_label.setText(f"File: {filename} | Size: {width}x{height}px | {info_text}")
-                
+            
                 # Auto adjust and display
                 self.image_processor.auto_adjust_contrast()
                 self._update_brightness_sliders()
-                self.update_display()
-            else:
-                QMessageBox.critical(self, "Error", f"Failed to load image:\n{error}")
+        else:
+            self.file_info_label.setText(self._file_info_before_load)
+            QMessageBox.critical(self, "Error", f"Failed to load image:\n{error}")
     
     def on_preset_changed(self, preset_name: str):
         """Handle preset selection change."""
@@ -466,21 +543,20 @@ class TEMImageEditor(QMainWindow):
             except Exception:
                 npp = 1.0
             
-            self.nm_per_pixel = npp
-            self._update_pixel_size_display()
-            
-            # Set preset-specific scalebar defaults (only if UI is fully initialized)
-            if hasattr(self, 'unit_combo') and hasattr(self, 'scalebar_length_spinbox'):
-                if preset_name == "Standard":
-                    self.unit_combo.setCurrentText("µm")
-                    self.scalebar_length_spinbox.setValue(5.0)
-                    self.scalebar_length_text_raw = "5"
-                elif preset_name == "High Res":
-                    self.unit_combo.setCurrentText("nm")
-                    self.scalebar_length_spinbox.setValue(500.0)
-                    self.scalebar_length_text_raw = "500"
+            with self._batched():
+                self.nm_per_pixel = npp
+                self._update_pixel_size_display()
             
-            self.update_display()
+                # Set preset-specific scalebar defaults (only if UI is fully initialized)
+                if hasattr(self, 'unit_combo') and hasattr(self, 'scalebar_length_spinbox'):
+                    if preset_name == "Standard":
+                        self.unit_combo.setCurrentText("µm")
+                        self.scalebar_length_spinbox.setValue(5.0)
+                        self.scalebar_length_text_raw = "5"
+                    elif preset_name == "High Res":
+                        self.unit_combo.setCurrentText("nm")
+                        self.scalebar_length_spinbox.setValue(500.0)
+                        self.scalebar_length_text_raw = "500"
     
     def _update_pixel_size_display(self):
         """Update pixel size spinbox display."""
@@ -495,22 +571,19 @@ class TEMImageEditor(QMainWindow):
         if npp <= 0:
             npp = 1.0
         self.nm_per_pixel = npp
-        self.presets["Custom"] = npp
+        if self.presets.get("Custom") != npp:
+            self.presets["Custom"] = npp
+            self._presets_dirty = True
         self.update_display()
     
     def on_pixel_size_unit_changed(self, unit: str):
         """Handle pixel size unit change."""
-        old_unit = self.pixel_size_unit
-        self.pixel_size_unit = unit
-        
-        current_val = self.pixel_size_spinbox.value()
-        self.pixel_size_spinbox.blockSignals(True)
-        if old_unit == "nm" and unit == "µm":
-            self.pixel_size_spinbox.setValue(current_val / 1000.0)
-        elif old_unit == "µm" and unit == "nm":
-            self.pixel_size_spinbox.setValue(current_val * 1000.0)
-        self.pixel_size_spinbox.blockSignals(False)
-        self.update_display()
+        # nm_per_pixel is the source of truth; derive the display value from
+        # it rather than rescaling the (rounded) spinbox value, so repeated
+        # unit toggles cannot drift
+        with self._batched():
+            self.pixel_size_unit = unit
+            self._update_pixel_size_display()
     
     def on_brightness_contrast_changed(self):
         """Handle brightness/contrast slider changes."""
@@ -597,7 +670,7 @@ class TEMImageEditor(QMainWindow):
     
     def on_bar_color_preset_changed(self, name: str):
         """Handle bar color preset change."""
-        self.overlay_renderer.bar_color = QColor(255, 255, 255) if name == "white" else QColor(0, 0, 0)
+        self.overlay_renderer.bar_color = _preset_color(name)
         self.update_display()
     
     def choose_bar_color(self):
@@ -609,7 +682,7 @@ class TEMImageEditor(QMainWindow):
     
     def on_text_color_preset_changed(self, name: str):
         """Handle text color preset change."""
-        self.overlay_renderer.text_color = QColor(255, 255, 255) if name == "white" else QColor(0, 0, 0)
+        self.overlay_renderer.text_color = _preset_color(name)
         self.update_display()
     
     def choose_text_color(self):
@@ -681,27 +754,101 @@ class TEMImageEditor(QMainWindow):
             self.update_display()
     
     def update_display(self):
+        """Schedule a repaint; repeated calls within one interval are coalesced."""
+        if self._suspend_repaints:
+            return
+        self._repaint_timer.start()
+    
+    @contextmanager
+    def _batched(self):
+        """Hold repaints for the duration of the block and issue one at the end."""
+        self._suspend_repaints += 1
+        try:
+            yield
+        finally:
+            self._suspend_repaints -= 1
+            if self._suspend_repaints == 0:
+                self.update_display()
+    
+    def _preview_factor(self) -> int:
+        """Integer downsampling factor that still covers the label at 1:1 or better."""
+        image = self.image_processor.get_original_image()
+        label_w, label_h = self.image_label.width(), self.image_label.height()
+        if image is None or label_w <= 0 or label_h <= 0:
+            return 1
+        height, width = image.shape[:2]
+        return max(1, min(width // label_w, height // label_h))
+    
+    def _render_cache_key(self, factor: int) -> tuple:
+        """Build a key covering every input the rendered frame depends on."""
+        processor = self.image_processor
+        return (
+            processor.revision, processor.min_val, processor.max_val, factor,
+            self.nm_per_pixel,
+        ) + self.overlay_renderer.settings_key()
+    
+    def _do_update_display(self):
         """Update the displayed image."""
         if not self.image_processor.has_image():
             return
         
-        # Get current image with overlays
-        q_image = self.overlay_renderer.render_image_with_overlays(
-            self.image_processor.get_current_image(),
-            self.nm_per_pixel
-        )
+        # Render a downsampled preview that is still at least as large as the
+        # label; overlays are scaled to match, so it looks like the export.
+        # Full resolution is only rendered in export_image.
+        factor = self._preview_factor()
+        key = self._render_cache_key(factor)
         
-        if q_image is None:
+        # Cheap scaling while a slider is being dragged; the smooth pass runs
+        # once on release (sliderReleased schedules another update)
+        if self._is_slider_dragging():
+            mode = Qt.TransformationMode.FastTransformation
+        else:
+            mode = Qt.TransformationMode.SmoothTransformation
+        
+        size = (self.image_label.width(), self.image_label.height())
+        cached_key, cached_size, cached_mode, _ = self._scaled_cache
+        if (cached_key, cached_size, cached_mode) == (key, size, mode):
+            # This exact frame is already on screen
             return
         
-        pixmap = QPixmap.fromImage(q_image)
+        pixmap = self._render_cache.get(key)
+        if pixmap is not None:
+            self._render_cache.move_to_end(key)
+        else:
+            # Get current image with overlays
+            q_image = self.overlay_renderer.render_image_with_overlays(
+                self.image_processor.get_preview_image(factor),
+                self.nm_per_pixel * factor,
+                1.0 / factor
+            )
+            
+            if q_image is None:
+                return
+            
+            # Recycle the least recently used pixmap when the cache is full:
+            # convertFromImage refills its existing backing store instead of
+            # allocating a new one. NoFormatConversion keeps the premultiplied
+            # RGBA as-is rather than dithering/converting it.
+            if len(self._render_cache) >= self._render_cache_size:
+                _, pixmap = self._render_cache.popitem(last=False)
+            else:
+                pixmap = QPixmap()
+            pixmap.convertFromImage(q_image, Qt.ImageConversionFlag.NoFormatConversion)
+            self._render_cache[key] = pixmap
+        
         scaled_pixmap = pixmap.scaled(
             self.image_label.size(),
             Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            mode
         )
+        self._scaled_cache = (key, size, mode, scaled_pixmap)
         self.image_label.setPixmap(scaled_pixmap)
     
+    def _is_slider_dragging(self) -> bool:
+        """Check whether the user is currently dragging one of the sliders."""
+        return any(slider.isSliderDown()
+                   for slider in (self.min_slider, self.max_slider, self.bg_opacity_slider))
+    
     def export_image(self):
         """Export the current image."""
         if not self.image_processor.has_image():
@@ -726,15 +873,6 @@ class TEMImageEditor(QMainWindow):
                     QMessageBox.warning(self, "Warning", "No image to export.")
                     return
                 
-                # Convert to RGBA8888
-                q_rgba = q_image.convertToFormat(QImage.Format.Format_RGBA8888)
-                width = q_rgba.width()
-                height = q_rgba.height()
-                ptr = q_rgba.bits()
-                ptr.setsize(height * width * 4)
-                arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-                export_rgba = arr.copy()
-                
                 # Determine DPI
                 input_dpi = self.image_processor.get_dpi()
                 if input_dpi and all(v > 0 for v in input_dpi):
@@ -743,29 +881,45 @@ class TEMImageEditor(QMainWindow):
                 else:
                     xdpi = ydpi = 300.0
                 
-                # Save
-                ext = Path(file_path).suffix.lower()
-                if ext in [".jpg", ".jpeg", ".bmp"]:
-                    export_rgb = export_rgba[:, :, :3]
-                    pil_image = Image.fromarray(export_rgb, mode='RGB')
-                    pil_image.save(file_path, dpi=(xdpi, ydpi))
-                else:
-                    pil_image = Image.fromarray(export_rgba, mode='RGBA')
-                    pil_image.save(file_path, dpi=(xdpi, ydpi))
-                
-                QMessageBox.information(self, "Success", f"Image exported successfully to:\n{file_path}")
+                # Encode and write on a worker thread. The full-size frame buffer
+                # is handed to the task rather than copied (the preview usually renders
+                # at a smaller size and reallocates anyway); a grayscale
+                # frame may still change under the task, so that one is copied.
+                frame = self.overlay_renderer.take_frame()
+                if frame is None:
+                    q_image = q_image.copy()
+                task = SaveImageTask(q_image, file_path, (xdpi, ydpi), frame)
+                task.signals.finished.connect(
+                    lambda path, error, task=task: self._on_image_saved(task, path, error))
+                self._save_tasks.add(task)
+                QThreadPool.globalInstance().start(task)
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export image:\n{str(e)}")
     
+    def _on_image_saved(self, task: SaveImageTask, file_path: str, error: Optional[str]):
+        """Handle completion of a background export."""
+        self._save_tasks.discard(task)
+        if error is None:
+            QMessageBox.information(self, "Success", f"Image exported successfully to:\n{file_path}")
+        else:
+            QMessageBox.critical(self, "Error", f"Failed to export image:\n{error}")
+    
     def manage_presets(self):
         """Open preset manager dialog."""
         dialog = PresetManager(self.presets, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.presets = dialog.get_presets()
             PresetStorage.save_presets(self.presets)
+            self._presets_dirty = False
             self._update_preset_combo()
     
+    def _flush_presets(self):
+        """Write presets to disk if they changed since the last save."""
+        if self._presets_dirty:
+            PresetStorage.save_presets(self.presets)
+            self._presets_dirty = False
+    
     def _update_preset_combo(self):
         """Update preset combo box."""
         current = self.preset_combo.currentText() if self.preset_combo.count() > 0 else None
@@ -784,11 +938,17 @@ class TEMImageEditor(QMainWindow):
             self.unit_combo.setCurrentText("nm")
             self.scalebar_length_spinbox.setValue(500)
     
-    def resizeEvent(self, event):
-        """Handle window resize."""
-        super().resizeEvent(event)
-        if self.image_processor.has_image():
-            QTimer.singleShot(100, self.update_display)
+    def closeEvent(self, event):
+        """Persist pending preset changes on close."""
+        self._flush_presets()
+        super().closeEvent(event)
+    
+    def eventFilter(self, obj, event):
+        """Schedule a repaint when the image display area is resized."""
+        if obj is self.image_label and event.type() == QEvent.Type.Resize:
+            if self.image_processor.has_image():
+                self.update_display()
+        return super().eventFilter(obj, event)
     
     def batch_annotate(self):
         """Open batch annotation dialog."""
@@ -799,6 +959,12 @@ class TEMImageEditor(QMainWindow):
 class BatchAnnotationDialog(QDialog):
     """Dialog for batch annotation of multiple images."""
     
+    # Preset-specific scalebar defaults: (unit, length, label text)
+    PRESET_DEFAULTS = {
+        "Standard": ("µm", 5.0, "5"),
+        "High Res": ("nm", 500.0, "500"),
+    }
+    
     def __init__(self, presets: dict, renderer: OverlayRenderer, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Batch Annotate Images")
@@ -808,7 +974,11 @@ class BatchAnnotationDialog(QDialog):
         self.presets = presets
         self.renderer = renderer
         self.files = []
+        self._files_set = set()  # Membership index for self.files
+        self._batch_timer = None  # Polls the running batch, see _process_all
         
+        # Preset signals can fire while _setup_ui is still creating widgets
+        self._initializing = True
         self._setup_ui()
         
     def _setup_ui(self):
@@ -1018,6 +1188,28 @@ class BatchAnnotationDialog(QDialog):
         format_layout.addWidget(self.format_combo)
         output_layout.addLayout(format_layout)
         
+        compress_layout = QHBoxLayout()
+        compress_layout.addWidget(QLabel("PNG compression:"))
+        self.compress_spinbox = QSpinBox()
+        self.compress_spinbox.setRange(0, 9)
+        self.compress_spinbox.setValue(DEFAULT_PNG_COMPRESS_LEVEL)
+        self.compress_spinbox.setToolTip("zlib level: 0 = fastest/largest, 9 = slowest/smallest")
+        compress_layout.addWidget(self.compress_spinbox)
+        output_layout.addLayout(compress_layout)
+        
+        quality_layout = QHBoxLayout()
+        quality_layout.addWidget(QLabel("JPEG quality:"))
+        self.jpeg_quality_spinbox = QSpinBox()
+        self.jpeg_quality_spinbox.setRange(1, 100)
+        self.jpeg_quality_spinbox.setValue(DEFAULT_JPEG_QUALITY)
+        self.jpeg_quality_spinbox.setToolTip("1 = smallest/lowest quality, 100 = largest/best quality")
+        quality_layout.addWidget(self.jpeg_quality_spinbox)
+        output_layout.addLayout(quality_layout)
+        
+        # Only the setting for the chosen format is editable
+        self.format_combo.currentTextChanged.connect(self._on_format_changed)
+        self._on_format_changed(self.format_combo.currentText())
+        
         output_group.setLayout(output_layout)
         layout.addWidget(output_group)
         
@@ -1040,6 +1232,7 @@ class BatchAnnotationDialog(QDialog):
         self.setLayout(layout)
         
         # Initialize preset
+        self._initializing = False
         self._on_preset_changed("Standard")
     
     def _add_files(self):
@@ -1049,48 +1242,63 @@ class BatchAnnotationDialog(QDialog):
             "Image Files (*.rodhypix *.tif *.tiff *.png *.jpg *.jpeg *.bmp);;RODHyPix Files (*.rodhypix);;TIFF Files (*.tif *.tiff);;All Files (*.*)"
         )
         if files:
+            new_files = []
             for file in files:
-                if file not in self.files:
-                    self.files.append(file)
-                    self.file_list.addItem(Path(file).name)
+                if file not in self._files_set:
+                    self._files_set.add(file)
+                    new_files.append(file)
+            self.files.extend(new_files)
+            self.file_list.addItems([Path(file).name for file in new_files])
     
     def _remove_selected(self):
         """Remove selected files from the list."""
         selected = self.file_list.selectedItems()
         if not selected:
             return
-        for item in selected:
-            row = self.file_list.row(item)
+        # Delete from the bottom up so earlier rows keep their indices
+        rows = sorted((self.file_list.row(item) for item in selected), reverse=True)
+        for row in rows:
+            self._files_set.discard(self.files[row])
+            del self.files[row]
             self.file_list.takeItem(row)
-            self.files.pop(row)
     
     def _clear_files(self):
         """Clear all files from the list."""
         self.files.clear()
+        self._files_set.clear()
         self.file_list.clear()
     
     def _on_preset_changed(self, preset_name: str):
         """Handle preset selection change."""
-        if preset_name in self.presets:
-            try:
-                npp = float(self.presets[preset_name])
-                if npp <= 0:
-                    npp = 1.0
-            except Exception:
+        if self._initializing or preset_name not in self.presets:
+            return
+        try:
+            npp = float(self.presets[preset_name])
+            if npp <= 0:
                 npp = 1.0
-            
+        except Exception:
+            npp = 1.0
+        
+        # Values are set programmatically; nothing downstream needs the
+        # intermediate change signals
+        widgets = (self.pixel_size_spinbox, self.pixel_unit_combo,
+                   self.scalebar_unit_combo, self.scalebar_length_spinbox)
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
             self.pixel_size_spinbox.setValue(npp)
             self.pixel_unit_combo.setCurrentText("nm")
             
             # Set preset-specific scalebar defaults
-            if preset_name == "Standard":
-                self.scalebar_unit_combo.setCurrentText("µm")
-                self.scalebar_length_spinbox.setValue(5.0)
-                self._batch_scalebar_length_text_raw = "5"
-            elif preset_name == "High Res":
-                self.scalebar_unit_combo.setCurrentText("nm")
-                self.scalebar_length_spinbox.setValue(500.0)
-                self._batch_scalebar_length_text_raw = "500"
+            defaults = self.PRESET_DEFAULTS.get(preset_name)
+            if defaults is not None:
+                unit, length, label_text = defaults
+                self.scalebar_unit_combo.setCurrentText(unit)
+                self.scalebar_length_spinbox.setValue(length)
+                self._batch_scalebar_length_text_raw = label_text
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
     
     def _choose_bar_color(self):
         """Choose bar color."""
@@ -1116,6 +1324,11 @@ class BatchAnnotationDialog(QDialog):
         if color.isValid():
             self.aperture_color = color
     
+    def _on_format_changed(self, output_format: str):
+        """Enable the encoder setting that applies to the chosen format."""
+        self.compress_spinbox.setEnabled(output_format == "PNG")
+        self.jpeg_quality_spinbox.setEnabled(output_format == "JPEG")
+    
     def _choose_output_folder(self):
         """Choose output folder."""
         folder = QFileDialog.getExistingDirectory(self, "Select Output Folder")
@@ -1171,117 +1384,95 @@ class BatchAnnotationDialog(QDialog):
         progress.setWindowModality(Qt.WindowModality.WindowModal)
         progress.setMinimumDuration(0)
         
-        # Process each file
-        processor = ImageProcessor()
-        renderer = OverlayRenderer()
-        
-        # Configure renderer
-        renderer.scalebar_enabled = scalebar_enabled
-        renderer.scalebar_length_value = float(scalebar_length)
-        renderer.scalebar_unit = scalebar_unit
-        renderer.scalebar_thickness = scalebar_thickness
-        renderer.scalebar_position = scalebar_position
-        renderer.bar_color = QColor(self.bar_color)
-        renderer.text_color = QColor(self.text_color)
-        renderer.scalebar_bg_enabled = self.bg_checkbox.isChecked()
-        renderer.scalebar_bg_color = QColor(self.bg_color)
-        renderer.scalebar_bg_opacity = self.bg_opacity_spinbox.value()
-        renderer.aperture_enabled = aperture_enabled
-        renderer.aperture_nominal_size = aperture_size
-        renderer.aperture_color = QColor(self.aperture_color)
         # Preserve label decimals in batch if provided
+        label_override = None
         override = getattr(self, '_batch_scalebar_length_text_raw', None)
         if isinstance(override, str) and override.strip() != "":
             try:
                 float(override)
-                renderer.scalebar_label_override = override.strip()
+                label_override = override.strip()
             except ValueError:
-                renderer.scalebar_label_override = None
-        
-        successful = 0
-        failed = []
+                label_override = None
+        
+        # Frozen, picklable settings shipped to the worker processes
+        config = BatchConfig(
+            nm_per_pixel=nm_per_pixel,
+            pixel_unit=pixel_unit,
+            auto_bc=auto_bc,
+            scalebar_enabled=scalebar_enabled,
+            scalebar_length=scalebar_length,
+            scalebar_unit=scalebar_unit,
+            scalebar_thickness=scalebar_thickness,
+            scalebar_position=scalebar_position,
+            bar_color=self.bar_color.getRgb(),
+            text_color=self.text_color.getRgb(),
+            bg_enabled=self.bg_checkbox.isChecked(),
+            bg_color=self.bg_color.getRgb(),
+            bg_opacity=self.bg_opacity_spinbox.value(),
+            aperture_enabled=aperture_enabled,
+            aperture_size=aperture_size,
+            aperture_color=self.aperture_color.getRgb(),
+            label_override=label_override,
+            output_folder=str(output_folder) if output_folder else None,
+            suffix=suffix,
+            output_format=output_format,
+            compress_level=self.compress_spinbox.value(),
+            jpeg_quality=self.jpeg_quality_spinbox.value(),
+        )
         
-        for i, file_path in enumerate(self.files):
-            if progress.wasCanceled():
-                break
-            
-            progress.setValue(i)
-            progress.setLabelText(f"Processing {Path(file_path).name}...")
-            QApplication.processEvents()
-            
+        # Render files in parallel; the pool is shut down again in done()
+        executor = get_executor(max(1, min(os.cpu_count() or 1, len(self.files))))
+        # future -> file, so a job whose worker died can still be named
+        self._batch_pending = {executor.submit(annotate_one, f, config): f
+                               for f in self.files}
+        self._batch_progress = progress
+        self._batch_done = 0
+        self._batch_successful = 0
+        self._batch_failed = []
+        
+        # Collect results from the event loop instead of blocking in a
+        # processEvents() loop; the dialog stays responsive between polls
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setInterval(50)
+        self._batch_timer.timeout.connect(self._poll_batch)
+        self._batch_timer.start()
+    
+    def _poll_batch(self):
+        """Collect finished batch jobs, update progress and finish when done."""
+        progress = self._batch_progress
+        still_pending = {}
+        for future, submitted_path in self._batch_pending.items():
+            if not future.done():
+                still_pending[future] = submitted_path
+                continue
+            if future.cancelled():
+                continue
             try:
-                # Load image
-                success, error, _, pixel_metadata = processor.load_image(file_path)
-                if not success:
-                    failed.append((file_path, error))
-                    continue
-                
-                # Use pixel metadata from rodhypix file if available, otherwise use provided value
-                file_nm_per_pixel = nm_per_pixel
-                if pixel_metadata and 'pixel_size_nm' in pixel_metadata:
-                    # Use pixel size from file header
-                    if pixel_size_unit == "µm":
-                        file_nm_per_pixel = pixel_metadata['pixel_size_um']
-                    else:
-                        file_nm_per_pixel = pixel_metadata['pixel_size_nm']
-                    print(f"Using pixel size from {Path(file_path).name}: {file_nm_per_pixel:.3f} {pixel_size_unit}")
-                
-                # Auto adjust if requested
-                if auto_bc:
-                    processor.auto_adjust_contrast()
-                
-                # Render with overlays
-                q_image = renderer.render_image_with_overlays(
-                    processor.get_current_image(),
-                    file_nm_per_pixel
-                )
-                
-                if q_image is None:
-                    failed.append((file_path, "Failed to render image"))
-                    continue
-                
-                # Determine output path
-                input_path = Path(file_path)
-                if output_folder:
-                    output_dir = output_folder
-                else:
-                    output_dir = input_path.parent
-                
-                output_name = input_path.stem + suffix + "." + output_format
-                output_path = output_dir / output_name
-                
-                # Convert and export
-                q_rgba = q_image.convertToFormat(QImage.Format.Format_RGBA8888)
-                width = q_rgba.width()
-                height = q_rgba.height()
-                ptr = q_rgba.bits()
-                ptr.setsize(height * width * 4)
-                arr = np.frombuffer(ptr, np.uint8).reshape((height, width, 4))
-                export_rgba = arr.copy()
-                
-                # Get DPI
-                input_dpi = processor.get_dpi()
-                if input_dpi and all(v > 0 for v in input_dpi):
-                    xdpi = min(input_dpi[0], 300.0)
-                    ydpi = min(input_dpi[1], 300.0)
-                else:
-                    xdpi = ydpi = 300.0
-                
-                # Save
-                if output_format in ["jpg", "jpeg", "bmp"]:
-                    export_rgb = export_rgba[:, :, :3]
-                    pil_image = Image.fromarray(export_rgb, mode='RGB')
-                    pil_image.save(str(output_path), dpi=(xdpi, ydpi))
-                else:
-                    pil_image = Image.fromarray(export_rgba, mode='RGBA')
-                    pil_image.save(str(output_path), dpi=(xdpi, ydpi))
-                
-                successful += 1
-                
+                file_path, error = future.result()
             except Exception as e:
-                failed.append((file_path, str(e)))
+                # The pool broke (e.g. a worker was killed) before this file finished
+                file_path, error = submitted_path, str(e)
+            self._batch_done += 1
+            if error is None:
+                self._batch_successful += 1
+            else:
+                self._batch_failed.append((file_path, error))
+            progress.setLabelText(f"Processed {Path(file_path).name}...")
+        self._batch_pending = still_pending
+        progress.setValue(self._batch_done)
+        
+        if progress.wasCanceled() and self._batch_pending:
+            # Drop queued files; the ones already running finish
+            for future in self._batch_pending:
+                future.cancel()
+        
+        if any(not f.done() for f in self._batch_pending):
+            return
         
+        self._batch_timer.stop()
         progress.setValue(len(self.files))
+        successful = self._batch_successful
+        failed = self._batch_failed
         
         # Show summary
         if failed:
@@ -1300,10 +1491,22 @@ class BatchAnnotationDialog(QDialog):
             )
         
         self.accept()
+    
+    def done(self, result: int):
+        """Stop the worker pool whenever the dialog closes, finished or not."""
+        if self._batch_timer is not None and self._batch_timer.isActive():
+            # Closed mid-batch: drop queued files without waiting for the
+            # ones still running
+            self._batch_timer.stop()
+            shutdown_executor(wait=False)
+        else:
+            shutdown_executor()
+        super().done(result)
 
 
 def main():
     """Main entry point."""
+    mp.freeze_support()
     os.environ.setdefault("QT_LOGGING_RULES", "qt.qpa.fonts.debug=false;qt.qpa.fonts.warning=false")
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
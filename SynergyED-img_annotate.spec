@@ -24,9 +24,12 @@ a = Analysis(
         'PyQt6.QtCore', 
         'PyQt6.QtGui', 
         'PyQt6.QtWidgets',
+        'core.batch_annotator',
         'core.image_processor',
+        'core.image_writer',
         'core.overlay_renderer',
         'gui.collapsible_box',
+        'gui.workers',
         'utils.preset_manager',
         'numpy',
         'PIL',
@@ -0,0 +1,201 @@
+"""
+Batch annotation module for TEM Image Editor.
+Per-file load/annotate/export used by the batch dialog. Everything here runs
+in worker processes, so settings travel as a frozen BatchConfig of plain
+Python values (colors as RGBA tuples) that can be pickled.
+"""
+
+import atexit
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PyQt6.QtGui import QColor, QGuiApplication
+
+from .image_processor import ImageProcessor
+from .image_writer import save_qimage
+from .kernels import HAS_NUMBA
+from .overlay_renderer import OverlayRenderer
+
+RGBA = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    """Immutable batch settings, built once by the dialog and shared by all files."""
+    nm_per_pixel: float
+    pixel_unit: str
+    auto_bc: bool
+    scalebar_enabled: bool
+    scalebar_length: float
+    scalebar_unit: str
+    scalebar_thickness: int
+    scalebar_position: str
+    bar_color: RGBA
+    text_color: RGBA
+    bg_enabled: bool
+    bg_color: RGBA
+    bg_opacity: int
+    aperture_enabled: bool
+    aperture_size: int
+    aperture_color: RGBA
+    label_override: Optional[str]
+    output_folder: Optional[str]
+    suffix: str
+    output_format: str
+    compress_level: int
+    jpeg_quality: int
+
+
+# Per-process Qt application; QPainter text rendering needs one
+_app: Optional[QGuiApplication] = None
+
+# Per-process processor and renderer, reused across files so the renderer's
+# cached overlay layer and scratch buffer survive between images of the
+# same size: (config, ImageProcessor, OverlayRenderer)
+_worker_state: Tuple[Optional[BatchConfig], Optional[ImageProcessor], Optional[OverlayRenderer]] = (None, None, None)
+
+
+# Pool for the running batch. Each worker holds a Qt application, a renderer
+# and its own load cache, so the pool is shut down as soon as the batch ends
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def get_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared worker pool, (re)creating it for max_workers processes."""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != max_workers:
+        shutdown_executor()
+        # spawn gives each worker a clean Qt state
+        _executor = ProcessPoolExecutor(max_workers=max_workers,
+                                        mp_context=mp.get_context("spawn"),
+                                        initializer=init_worker)
+        _executor_workers = max_workers
+    return _executor
+
+
+@atexit.register
+def shutdown_executor(wait: bool = True):
+    """Stop the shared worker pool, if one is running, dropping queued jobs."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+def init_worker():
+    """Prepare a worker process for off-screen rendering."""
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    _app = QGuiApplication.instance() or QGuiApplication([])
+    if HAS_NUMBA:
+        # Parallelism comes from the processes; all-core kernels in every
+        # worker would put cores**2 threads on the CPU
+        from numba import set_num_threads  # type: ignore
+        set_num_threads(1)
+
+
+def _build_renderer(config: BatchConfig) -> OverlayRenderer:
+    """Create an OverlayRenderer configured from the batch settings."""
+    renderer = OverlayRenderer()
+    renderer.scalebar_enabled = config.scalebar_enabled
+    renderer.scalebar_length_value = float(config.scalebar_length)
+    renderer.scalebar_unit = config.scalebar_unit
+    renderer.scalebar_thickness = config.scalebar_thickness
+    renderer.scalebar_position = config.scalebar_position
+    renderer.bar_color = QColor(*config.bar_color)
+    renderer.text_color = QColor(*config.text_color)
+    renderer.scalebar_bg_enabled = config.bg_enabled
+    renderer.scalebar_bg_color = QColor(*config.bg_color)
+    renderer.scalebar_bg_opacity = config.bg_opacity
+    renderer.aperture_enabled = config.aperture_enabled
+    renderer.aperture_nominal_size = config.aperture_size
+    renderer.aperture_color = QColor(*config.aperture_color)
+    renderer.scalebar_label_override = config.label_override
+    return renderer
+
+
+def _get_worker_state(config: BatchConfig) -> Tuple[ImageProcessor, OverlayRenderer]:
+    """Return this process's processor and renderer, rebuilt if the config changed."""
+    global _worker_state
+    cached_config, processor, renderer = _worker_state
+    if cached_config != config or processor is None or renderer is None:
+        processor = ImageProcessor()
+        renderer = _build_renderer(config)
+        _worker_state = (config, processor, renderer)
+    return processor, renderer
+
+
+def annotate_one(file_path: str, config: BatchConfig) -> Tuple[str, Optional[str]]:
+    """
+    Load, annotate and export a single image.
+
+    Args:
+        file_path: Image to process
+        config: Settings built by the batch dialog
+
+    Returns:
+        (file_path, error_message) with error_message None on success
+    """
+    try:
+        processor, renderer = _get_worker_state(config)
+
+        # Load image
+        success, error, _, pixel_metadata = processor.load_image(file_path)
+        if not success:
+            return file_path, error
+
+        # Use pixel metadata from rodhypix file if available, otherwise use provided value
+        file_nm_per_pixel = config.nm_per_pixel
+        if pixel_metadata and 'pixel_size_nm' in pixel_metadata:
+            # Use pixel size from file header
+            if config.pixel_unit == "µm":
+                file_nm_per_pixel = pixel_metadata['pixel_size_um']
+            else:
+                file_nm_per_pixel = pixel_metadata['pixel_size_nm']
+            print(f"Using pixel size from {Path(file_path).name}: {file_nm_per_pixel:.3f} {config.pixel_unit}")
+
+        # Auto adjust if requested
+        if config.auto_bc:
+            processor.auto_adjust_contrast()
+
+        # Render with overlays
+        q_image = renderer.render_image_with_overlays(
+            processor.get_current_image(),
+            file_nm_per_pixel
+        )
+
+        if q_image is None:
+            return file_path, "Failed to render image"
+
+        # Determine output path
+        input_path = Path(file_path)
+        if config.output_folder:
+            output_dir = Path(config.output_folder)
+        else:
+            output_dir = input_path.parent
+
+        output_format = config.output_format
+        output_name = input_path.stem + config.suffix + "." + output_format
+        output_path = output_dir / output_name
+
+        # Get DPI
+        input_dpi = processor.get_dpi()
+        if input_dpi and all(v > 0 for v in input_dpi):
+            xdpi = min(input_dpi[0], 300.0)
+            ydpi = min(input_dpi[1], 300.0)
+        else:
+            xdpi = ydpi = 300.0
+
+        # Save
+        save_qimage(q_image, str(output_path), (xdpi, ydpi),
+                    config.compress_level, config.jpeg_quality)
+
+        return file_path, None
+
+    except Exception as e:
+        return file_path, str(e)
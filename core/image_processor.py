@@ -3,22 +3,199 @@ Image processing module for TEM Image Editor.
 Handles image loading, transformations, and brightness/contrast adjustments.
 """
 
+import os
+import threading
+from collections import OrderedDict
 from typing import Optional, Tuple, Dict
+from itertools import count
 import numpy as np
 from PIL import Image
 from pathlib import Path
 
+from .kernels import HAS_NUMBA, apply_lut, histogram_u8, minmax, normalize_u8
+
+# Per-load diagnostics (value range, mean, normalization) cost extra passes
+# over the whole image; enable with TEM_EDITOR_DEBUG=1
+DEBUG = bool(os.environ.get("TEM_EDITOR_DEBUG"))
+
+# Pixels sampled (on a regular grid) for auto-contrast percentiles
+AUTO_CONTRAST_SAMPLES = 500_000
+
+# Decoded, normalized images keyed by (path, mtime_ns, size), so re-opening an
+# unchanged file in the editor skips decoding. Per process: batch workers each
+# have their own. Bounded by total bytes since detector frames can be tens of
+# MB each.
+LOAD_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_load_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_load_cache_bytes = 0
+_load_cache_lock = threading.Lock()  # Images load on QThreadPool workers
+
+
+def _load_cache_key(file_path: str) -> Optional[tuple]:
+    """Cache key that changes whenever the file is modified, or None if unstattable."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+def _load_cache_put(key: tuple, entry: tuple):
+    """Store a decoded entry, evicting least recently used ones over budget."""
+    global _load_cache_bytes
+    original, raw = entry[0], entry[1]
+    nbytes = original.nbytes + (raw.nbytes if raw is not original else 0)
+    if nbytes > LOAD_CACHE_MAX_BYTES:
+        return
+    # Shared with every processor that loads this file; rebinding (flips,
+    # normalization) is fine, writing in place is not
+    original.setflags(write=False)
+    raw.setflags(write=False)
+    with _load_cache_lock:
+        if key in _load_cache:
+            return
+        _load_cache[key] = entry
+        _load_cache_bytes += nbytes
+        while _load_cache_bytes > LOAD_CACHE_MAX_BYTES:
+            _, (old_original, old_raw, *_) = _load_cache.popitem(last=False)
+            _load_cache_bytes -= old_original.nbytes + (old_raw.nbytes if old_raw is not old_original else 0)
+
+
+def _load_cache_get(key: Optional[tuple]) -> Optional[tuple]:
+    """Look up a decoded entry and mark it most recently used."""
+    if key is None:
+        return None
+    with _load_cache_lock:
+        entry = _load_cache.get(key)
+        if entry is not None:
+            _load_cache.move_to_end(key)
+        return entry
+
+
+# TIFF/PIL resolution units (2 = inch, 3 = cm) to pixels-per-inch factor;
+# anything else is taken as inches, as before
+_UNIT_TO_INCH = {2: 1.0, 3: 2.54}
+
+
+def _rational(value) -> float:
+    """TIFF rationals arrive as IFDRational or as (numerator, denominator)."""
+    try:
+        num, den = value
+    except TypeError:
+        return float(value)
+    return float(num / den)
+
+
+def _read_dpi(pil_image: Image.Image) -> Optional[Tuple[float, float]]:
+    """Resolution from the file header (DPI info, TIFF resolution tags), if any."""
+    info = pil_image.info
+    tag = getattr(pil_image, 'tag_v2', None)
+    try:
+        dpi = info.get('dpi')
+        if dpi:
+            x, y = dpi
+            return float(x), float(y)
+        
+        # Some TIFFs store resolution differently
+        res = info.get('resolution')
+        if res:
+            x, y = res
+            scale = _UNIT_TO_INCH.get(info.get('resolution_unit', 2), 1.0)
+            return float(x) * scale, float(y) * scale
+        
+        # Fallback to TIFF tags (XResolution, YResolution, ResolutionUnit)
+        if tag is not None:
+            x, y = tag.get(282), tag.get(283)
+            if x and y:
+                scale = _UNIT_TO_INCH.get(tag.get(296), 1.0)
+                return _rational(x) * scale, _rational(y) * scale
+    except Exception:
+        pass
+    return None
+
+
+# Per-dtype normalization to uint8 for an image with min < max. Each returns
+# (normalized image, raw window); the raw window is (min, max) when the raw
+# data can drive the 16-bit display table, else None.
+
+def _raw_levels(raw_min: int, raw_max: int) -> np.ndarray:
+    """Normalized (0-255, untruncated) value of every 16-bit level up to raw_max."""
+    return (np.arange(raw_max + 1, dtype=np.float64) - raw_min) / (raw_max - raw_min) * 255
+
+
+def _normalize_uint16(image: np.ndarray, img_min, img_max):
+    """16-bit: at most 65536 levels, so evaluate the formula per level and gather."""
+    # Shares _raw_levels with the 16-bit display table, so both agree exactly
+    raw_window = (int(img_min), int(img_max))
+    lut = _raw_levels(*raw_window).astype(np.uint8)
+    # Parallel gather with Numba, instead of single-threaded fancy indexing
+    out = np.empty(image.shape, dtype=np.uint8)
+    return apply_lut(image, lut, out), raw_window
+
+
+def _normalize_float(image: np.ndarray, img_min, img_max):
+    """32- or 64-bit float, scaled straight into the uint8 result."""
+    # image is raw_image, so it is not modified
+    out = np.empty(image.shape, dtype=np.uint8)
+    return normalize_u8(image, img_min, img_max, out), None
+
+
+def _normalize_int32(image: np.ndarray, img_min, img_max):
+    """32-bit integer; a table when the range is narrow (typical counting detectors)."""
+    if int(img_max) - int(img_min) < 65536:
+        # Same table approach as 16-bit, offset so negative values index too
+        levels = np.arange(int(img_max) - int(img_min) + 1, dtype=np.float64)
+        lut = (levels / (img_max - img_min) * 255).astype(np.uint8)
+        return lut[image - img_min], None
+    return _normalize_generic(image, img_min, img_max)
+
+
+def _normalize_generic(image: np.ndarray, img_min, img_max):
+    """Fallback for any other dtype."""
+    out = np.empty(image.shape, dtype=np.uint8)
+    return normalize_u8(image, img_min, img_max, out), None
+
+
+# dtype -> (diagnostic label, normalizer)
+_NORMALIZERS = {
+    np.uint16: ("16-bit image", _normalize_uint16),
+    np.float32: ("Float image", _normalize_float),
+    np.float64: ("Float image", _normalize_float),
+    np.uint32: ("32-bit integer image", _normalize_int32),
+    np.int32: ("32-bit integer image", _normalize_int32),
+}
+
 
 class ImageProcessor:
     """Handles all image processing operations."""
     
+    # Shared across instances so a revision never repeats between processors
+    _revision_counter = count(1)
+    
     def __init__(self):
         self.original_image: Optional[np.ndarray] = None
-        self.raw_image: Optional[np.ndarray] = None  # Store raw data before normalization
+        self.raw_image: Optional[np.ndarray] = None  # Raw 16-bit data before normalization, else original_image
         self.current_image: Optional[np.ndarray] = None
         self.input_dpi: Optional[Tuple[float, float]] = None
+        # Header metadata of the loaded file (format, mode, size, dpi)
+        self.source_metadata: Dict[str, object] = {}
         self.min_val = 0
         self.max_val = 255
+        self._lut: Optional[np.ndarray] = None
+        self._lut_key: Optional[tuple] = None  # (min_val, max_val, raw_window) _lut was built for
+        # (min, max) of a 16-bit raw_image. When set, brightness/contrast is
+        # applied to raw_image through a 16-bit table, so a narrow window
+        # still spreads over all 256 output levels instead of stretching the
+        # few 8-bit levels left after normalization.
+        self._raw_window: Optional[Tuple[int, int]] = None
+        self._bc_out: Optional[np.ndarray] = None  # Reused storage for current_image
+        # Area-downsampled copy of original_image for interactive display:
+        # (revision, factor, array)
+        self._preview_source: Tuple[int, int, Optional[np.ndarray]] = (0, 0, None)
+        self._preview_out: Optional[np.ndarray] = None  # Reused stretched preview
+        # Changes whenever original_image changes (load, flips) so callers can
+        # key caches on the image content without hashing pixels
+        self.revision = 0
         
     def load_image(self, file_path: str) -> Tuple[bool, Optional[str], Optional[Tuple[int, int]], Optional[Dict[str, float]]]:
         """
@@ -33,8 +210,20 @@ class ImageProcessor:
             'pixel_size_um': pixel size in micrometers (calculated from mm)
         """
         try:
+            cache_key = _load_cache_key(file_path)
+            cached = _load_cache_get(cache_key)
+            if cached is not None:
+                (self.original_image, self.raw_image, self.input_dpi,
+                 self.source_metadata, self._raw_window, pixel_metadata) = cached
+                if pixel_metadata is not None:
+                    pixel_metadata = dict(pixel_metadata)
+                if DEBUG:
+                    print(f"Using cached decode of {Path(file_path).name}")
+                return self._finish_load(pixel_metadata)
+            
             file_ext = Path(file_path).suffix.lower()
             pixel_metadata: Optional[Dict[str, float]] = None
+            extrema = None
             
             # Check if it's a .rodhypix file
             if file_ext == '.rodhypix':
@@ -43,7 +232,17 @@ class ImageProcessor:
                 # Load using RODImageReader
                 reader = RODImageReader(file_path, use_cpp=False, use_numba=True)
                 self.original_image = reader.get_raw_data()
-                self.raw_image = self.original_image.copy()
+                # The decoder produces int32, but detector counts normally fit
+                # 16 bits: narrowing halves the raw data kept in memory and
+                # lets brightness/contrast use the 16-bit raw-window table.
+                # The extrema are needed for normalization anyway.
+                extrema = minmax(self.original_image)
+                if 0 <= extrema[0] and extrema[1] <= np.iinfo(np.uint16).max:
+                    self.original_image = self.original_image.astype(np.uint16)
+                # Shared rather than copied: normalization below rebinds
+                # original_image, and read-only guards the raw data
+                self.raw_image = self.original_image
+                self.raw_image.setflags(write=False)
                 
                 # Get all header info for calibration
                 header_info = reader.get_header_info()
@@ -106,134 +305,149 @@ class ImageProcessor:
                 
                 # No DPI information for rodhypix files
                 self.input_dpi = None
+                height, width = self.original_image.shape
+                self.source_metadata = {
+                    'format': 'RODHyPix',
+                    'mode': str(self.original_image.dtype),
+                    'size': (width, height),
+                    'dpi': None,
+                }
                 
             else:
-                # Load image using PIL for standard formats
-                pil_image = Image.open(file_path)
-            # else:
-            #     # Load image using PIL for standard formats
-            #     pil_image = Image.open(file_path)
-            
-                # Try to capture source DPI metadata
-                self.input_dpi = None
-                try:
-                    dpi = pil_image.info.get('dpi')
-                    if dpi and isinstance(dpi, (tuple, list)) and len(dpi) == 2:
-                        self.input_dpi = (float(dpi[0]), float(dpi[1]))
-                    else:
-                        # Some TIFFs store resolution differently
-                        res = pil_image.info.get('resolution')
-                        unit = pil_image.info.get('resolution_unit', 2)  # 2=inches, 3=cm
-                        if res and isinstance(res, (tuple, list)) and len(res) == 2:
-                            xres, yres = float(res[0]), float(res[1])
-                            if unit == 3:  # cm -> inch
-                                xres *= 2.54
-                                yres *= 2.54
-                            self.input_dpi = (xres, yres)
-                        else:
-                            # Fallback to TIFF tags if available
-                            tag = getattr(pil_image, 'tag_v2', None)
-                            if tag is not None:
-                                xres = tag.get(282)  # XResolution
-                                yres = tag.get(283)  # YResolution
-                                unit_tag = tag.get(296)  # ResolutionUnit (2=in, 3=cm)
-                                if xres and yres:
-                                    xval = float(xres[0] / xres[1]) if isinstance(xres, (tuple, list)) else float(xres)
-                                    yval = float(yres[0] / yres[1]) if isinstance(yres, (tuple, list)) else float(yres)
-                                    if unit_tag == 3:  # cm
-                                        xval *= 2.54
-                                        yval *= 2.54
-                                    self.input_dpi = (xval, yval)
-                except Exception:
-                    self.input_dpi = None
-            
-                # Convert to grayscale if needed
-                if pil_image.mode not in ['L', 'I', 'I;16', 'F']:
-                    pil_image = pil_image.convert('L')
-            
-                self.original_image = np.array(pil_image)
-                self.raw_image = self.original_image.copy()  # Store raw data before normalization
-            
-            # Print diagnostic info
-            print(f"Loaded image dtype: {self.original_image.dtype}")
-            print(f"Image range: min={np.min(self.original_image):.2f}, max={np.max(self.original_image):.2f}")
-            print(f"Image mean: {np.mean(self.original_image):.2f}")
-            
-            # Handle different bit depths and normalize to 8-bit
-            if self.original_image.dtype == np.uint16:
-                # 16-bit unsigned integer
-                img_min = np.min(self.original_image)
-                img_max = np.max(self.original_image)
-                print(f"16-bit image detected, normalizing range [{img_min}, {img_max}] to [0, 255]")
-                
-                if img_max > img_min:
-                    normalized = (self.original_image.astype(np.float32) - img_min) / (img_max - img_min) * 255
-                    self.original_image = normalized.astype(np.uint8)
-                else:
-                    self.original_image = np.zeros_like(self.original_image, dtype=np.uint8)
-                    
-            elif self.original_image.dtype in [np.float32, np.float64]:
-                # 32-bit or 64-bit float
-                img_min = np.min(self.original_image)
-                img_max = np.max(self.original_image)
-                print(f"Float image detected, normalizing range [{img_min:.4f}, {img_max:.4f}] to [0, 255]")
-                
-                if img_max > img_min:
-                    normalized = (self.original_image - img_min) / (img_max - img_min) * 255
-                    self.original_image = normalized.astype(np.uint8)
-                else:
-                    self.original_image = np.zeros((self.original_image.shape), dtype=np.uint8)
-                    
-            elif self.original_image.dtype == np.uint32 or self.original_image.dtype == np.int32:
-                # 32-bit integer
-                img_min = np.min(self.original_image)
-                img_max = np.max(self.original_image)
-                print(f"32-bit integer image detected, normalizing range [{img_min}, {img_max}] to [0, 255]")
+                # Load image using PIL for standard formats. The context manager
+                # closes the file handle; Image.open leaves a multi-page TIFF on
+                # page 0, and load() decodes just that frame once, up front.
+                with Image.open(file_path) as pil_image:
+                    # Header metadata is parsed by open(); read it before
+                    # decoding so nothing needs to reopen the file later
+                    self.input_dpi = _read_dpi(pil_image)
+                    self.source_metadata = {
+                        'format': pil_image.format,
+                        'mode': pil_image.mode,
+                        'size': pil_image.size,
+                        'dpi': self.input_dpi,
+                    }
+                    pil_image.load()
                 
-                if img_max > img_min:
-                    normalized = (self.original_image.astype(np.float64) - img_min) / (img_max - img_min) * 255
-                    self.original_image = normalized.astype(np.uint8)
-                else:
-                    self.original_image = np.zeros((self.original_image.shape), dtype=np.uint8)
-            
-            # If already 8-bit, use as-is
-            elif self.original_image.dtype != np.uint8:
-                # Fallback for any other type
-                print(f"Unknown dtype {self.original_image.dtype}, converting to uint8")
-                img_min = np.min(self.original_image)
-                img_max = np.max(self.original_image)
-                if img_max > img_min:
-                    normalized = (self.original_image.astype(np.float64) - img_min) / (img_max - img_min) * 255
-                    self.original_image = normalized.astype(np.uint8)
-                else:
-                    self.original_image = np.zeros((self.original_image.shape), dtype=np.uint8)
+                    # Convert to grayscale if needed; integer/float modes (including
+                    # 16-bit TIFF) are kept native, not squashed through 'L'
+                    if pil_image.mode not in ['L', 'I', 'I;16', 'I;16B', 'I;16L', 'F']:
+                        pil_image = pil_image.convert('L')
             
-            print(f"After normalization: dtype={self.original_image.dtype}, range=[{np.min(self.original_image)}, {np.max(self.original_image)}]")
+                    # np.asarray takes Pillow's decoded buffer without an extra copy.
+                    # raw_image can share it because normalization below rebinds
+                    # original_image rather than writing into it.
+                    self.original_image = np.asarray(pil_image)
+                    if not self.original_image.dtype.isnative:
+                        # I;16B decodes big-endian; swap once so it takes the
+                        # uint16 path (and the kernels, which need native order)
+                        self.original_image = self.original_image.astype(
+                            self.original_image.dtype.newbyteorder('='))
+                    self.raw_image = self.original_image  # Raw data before normalization
+                    
+                    if not HAS_NUMBA and pil_image.mode in ['I', 'I;16', 'I;16L']:
+                        # Without the fused kernel NumPy needs a min and a max
+                        # scan; Pillow finds both in one C pass over its buffer
+                        extrema = pil_image.getextrema()
             
-            self.current_image = self.original_image.copy()
+            # 8-bit grayscale (the common case) is display-ready as decoded:
+            # no reductions, no table, no allocation
+            self._raw_window = None
+            if DEBUG or self.original_image.dtype != np.uint8:
+                self._normalize_to_uint8(extrema)
+            if self._raw_window is None:
+                # Only the 16-bit display table reads raw_image; for other
+                # dtypes (int32 rodhypix frames, float) keeping the decoded
+                # array would hold 4-8 bytes per pixel, here and in the load
+                # cache, that nothing uses
+                self.raw_image = self.original_image
             
-            # Get dimensions
-            height, width = self.original_image.shape
+            if cache_key is not None:
+                _load_cache_put(cache_key, (self.original_image, self.raw_image, self.input_dpi,
+                                            self.source_metadata, self._raw_window,
+                                            dict(pixel_metadata) if pixel_metadata else pixel_metadata))
             
-            return True, None, (width, height), pixel_metadata
+            return self._finish_load(pixel_metadata)
             
         except Exception as e:
             return False, str(e), None, None
     
+    def _normalize_to_uint8(self, extrema: Optional[Tuple[float, float]] = None):
+        """
+        Rebind original_image to an 8-bit normalization of the decoded data (kept in raw_image).
+        
+        Args:
+            extrema: (min, max) of the data if the decoder already knows it
+        """
+        image = self.original_image
+        # One fused min/max scan, shared by the diagnostics and normalization
+        img_min, img_max = extrema if extrema is not None else minmax(image)
+        
+        # Print diagnostic info
+        if DEBUG:
+            print(f"Loaded image dtype: {image.dtype}")
+            print(f"Image range: min={img_min:.2f}, max={img_max:.2f}")
+            print(f"Image mean: {np.mean(image):.2f}")
+        
+        # If already 8-bit, use as-is
+        if image.dtype != np.uint8:
+            label, normalize = _NORMALIZERS.get(image.dtype.type, ("Unknown dtype", _normalize_generic))
+            if DEBUG:
+                print(f"{label} {image.dtype}, normalizing range [{img_min}, {img_max}] to [0, 255]")
+            if img_max > img_min:
+                self.original_image, self._raw_window = normalize(image, img_min, img_max)
+            else:
+                self.original_image = np.zeros(image.shape, dtype=np.uint8)
+        
+        if DEBUG:
+            norm_min, norm_max = minmax(self.original_image)
+            print(f"After normalization: dtype={self.original_image.dtype}, range=[{norm_min}, {norm_max}]")
+    
+    def _finish_load(self, pixel_metadata: Optional[Dict[str, float]]) -> Tuple[bool, Optional[str], Optional[Tuple[int, int]], Optional[Dict[str, float]]]:
+        """Reset derived state for a newly loaded original_image and build load_image's result."""
+        self.current_image = self._unadjusted_view()
+        self.revision = next(self._revision_counter)
+        
+        # Get dimensions
+        height, width = self.original_image.shape
+        
+        return True, None, (width, height), pixel_metadata
+    
     def auto_adjust_contrast(self):
         """Automatically adjust brightness/contrast based on image histogram."""
         if self.original_image is None:
             return
         
+        # Percentiles of a regular ~500k-pixel grid are indistinguishable
+        # from the full image's for picking a window, at a fraction of the reads
+        step = max(1, int(np.sqrt(self.original_image.size / AUTO_CONTRAST_SAMPLES)))
+        sample = self.original_image[::step, ::step]
+        
         # Calculate percentiles for auto-adjustment
         # Use more aggressive percentiles (0.1% and 99.9%) to better handle the normalized 8-bit data
-        p_low = np.percentile(self.original_image, 0.1)
-        p_high = np.percentile(self.original_image, 99.9)
+        if sample.dtype == np.uint8:
+            # For 8-bit data one histogram pass yields both percentiles,
+            # instead of copying and partitioning the whole image.
+            # side='right' picks the same order statistic np.percentile
+            # starts from, just without interpolating towards the next level.
+            # The same lookup also gives min (rank 0) and max (rank last).
+            cdf = np.cumsum(histogram_u8(sample))
+            last = cdf[-1] - 1
+            p_low, p_high, img_min, img_max = np.searchsorted(
+                cdf, [0.001 * last, 0.999 * last, 0, last], side='right')
+        else:
+            # Both in one call: percentile copies and partitions the whole image
+            p_low, p_high = np.percentile(sample, [0.1, 99.9])
+            img_min = img_max = None
+        if step > 1:
+            # The fallback window must cover the true extremes, not the sample's
+            img_min = img_max = None
         
         # Ensure min and max are different
         if p_high <= p_low:
-            p_low = np.min(self.original_image)
-            p_high = np.max(self.original_image)
+            if img_min is None:
+                img_min, img_max = minmax(self.original_image)
+            p_low, p_high = img_min, img_max
         
         # Add some margin if the range is still too narrow
         range_val = p_high - p_low
@@ -245,7 +459,8 @@ class ImageProcessor:
         self.min_val = int(p_low)
         self.max_val = int(p_high)
         
-        print(f"Auto-adjust: min={self.min_val}, max={self.max_val} (range={self.max_val - self.min_val})")
+        if DEBUG:
+            print(f"Auto-adjust: min={self.min_val}, max={self.max_val} (range={self.max_val - self.min_val})")
         
         self.apply_brightness_contrast()
     
@@ -255,30 +470,84 @@ class ImageProcessor:
         self.max_val = max_val
         self.apply_brightness_contrast()
     
-    def apply_brightness_contrast(self):
-        """Apply brightness/contrast adjustment to the image."""
-        if self.original_image is None:
-            return
-        
-        # Apply contrast stretching with proper input->output mapping
-        # min_val and max_val define the INPUT range that gets mapped to 0-255 OUTPUT
-        img = self.original_image.astype(np.float32)
-        
+    def _get_lut(self) -> np.ndarray:
+        """Return the lookup table for the current window, rebuilding it only on change."""
+        key = (self.min_val, self.max_val, self._raw_window)
+        if self._lut is None or self._lut_key != key:
+            self._lut = self._build_lut() if self._raw_window is None else self._build_raw_lut()
+            self._lut_key = key
+        return self._lut
+    
+    def _build_raw_lut(self) -> np.ndarray:
+        """
+        Build the uint8 table indexed by 16-bit raw values.
+
+        Composes the load-time normalization (without its truncation to
+        8 bits) with the min/max window, so at the default window it
+        reproduces original_image exactly.
+        """
+        levels = _raw_levels(*self._raw_window)
+        # The identity window is skipped rather than computed, so rounding in
+        # the window step cannot move a value across an integer boundary
+        if self.max_val > self.min_val and (self.min_val, self.max_val) != (0, 255):
+            levels = (levels - self.min_val) / (self.max_val - self.min_val) * 255
+        np.clip(levels, 0, 255, out=levels)
+        return levels.astype(np.uint8)
+    
+    def _display_source(self) -> np.ndarray:
+        """Image the contrast table is applied to: 16-bit raw data when available."""
+        return self.raw_image if self._raw_window is not None else self.original_image
+    
+    def _build_lut(self) -> np.ndarray:
+        """Build the 256-entry uint8 lookup table for the current min/max window."""
+        levels = np.arange(256, dtype=np.float32)
         if self.max_val > self.min_val:
             # Map [min_val, max_val] input range to [0, 255] output range
             # Values below min_val -> black (0)
             # Values above max_val -> white (255)
-            img = (img - self.min_val) / (self.max_val - self.min_val) * 255
-            img = np.clip(img, 0, 255)
+            levels = (levels - self.min_val) / (self.max_val - self.min_val) * 255
+            levels = np.clip(levels, 0, 255)
+        return levels.astype(np.uint8)
+    
+    def apply_brightness_contrast(self):
+        """Apply brightness/contrast adjustment to the image."""
+        if self.original_image is None:
+            return
         
-        self.current_image = img.astype(np.uint8)
+        # The display source is 8-bit (or 16-bit raw data), so the contrast
+        # stretch is a pure function of the input level: a single table
+        # gather replaces the float32 subtract/divide/clip/cast passes
+        self.current_image = apply_lut(self._display_source(), self._get_lut(), self._output_buffer())
+    
+    def _output_buffer(self) -> np.ndarray:
+        """
+        Return the uint8 buffer current_image lives in, sized to original_image.
+
+        It is reused across slider ticks and, in batch workers, across files
+        of the same size, so a detector-sized image is not reallocated for
+        every adjustment.
+        """
+        if self._bc_out is None or self._bc_out.shape != self.original_image.shape:
+            self._bc_out = np.empty(self.original_image.shape, dtype=np.uint8)
+        return self._bc_out
+    
+    def _unadjusted_view(self) -> np.ndarray:
+        """
+        current_image for the default window: original_image itself, no copy.
+
+        Returned read-only so nothing can write through it into
+        original_image; adjustments always go to the output buffer.
+        """
+        view = self.original_image.view()
+        view.setflags(write=False)
+        return view
     
     def reset_brightness_contrast(self):
         """Reset brightness/contrast to default."""
         self.min_val = 0
         self.max_val = 255
         if self.original_image is not None:
-            self.current_image = self.original_image.copy()
+            self.current_image = self._unadjusted_view()
     
     def flip_horizontal(self):
         """Flip the image horizontally (left-right)."""
@@ -286,7 +555,15 @@ class ImageProcessor:
             return
         
         self.original_image = np.fliplr(self.original_image)
-        self.apply_brightness_contrast()
+        if self.raw_image is not None:
+            self.raw_image = np.fliplr(self.raw_image)
+        # Contrast is per-pixel, so flipping the already stretched image
+        # gives the same result; both are stride-only views, no pixel pass
+        if self.current_image is not None:
+            self.current_image = np.fliplr(self.current_image)
+        previous_revision = self.revision
+        self.revision = next(self._revision_counter)
+        self._flip_preview_source(np.fliplr, previous_revision, 1)
     
     def flip_vertical(self):
         """Flip the image vertically (top-bottom)."""
@@ -294,12 +571,65 @@ class ImageProcessor:
             return
         
         self.original_image = np.flipud(self.original_image)
-        self.apply_brightness_contrast()
+        if self.raw_image is not None:
+            self.raw_image = np.flipud(self.raw_image)
+        # Contrast is per-pixel, so flipping the already stretched image
+        # gives the same result; both are stride-only views, no pixel pass
+        if self.current_image is not None:
+            self.current_image = np.flipud(self.current_image)
+        previous_revision = self.revision
+        self.revision = next(self._revision_counter)
+        self._flip_preview_source(np.flipud, previous_revision, 0)
+    
+    def _flip_preview_source(self, flip, previous_revision: int, axis: int):
+        """
+        Carry the downsampled preview across a flip instead of re-averaging.
+        
+        Only exact when the preview blocks tile the flipped axis completely;
+        otherwise the cropped remainder moves to the other edge and the
+        preview is rebuilt on the next request.
+        """
+        revision, factor, source = self._preview_source
+        if source is not None and revision == previous_revision and self.original_image.shape[axis] % factor == 0:
+            self._preview_source = (self.revision, factor, flip(source))
     
     def get_current_image(self) -> Optional[np.ndarray]:
         """Get the current processed image."""
         return self.current_image
     
+    def get_preview_image(self, factor: int) -> Optional[np.ndarray]:
+        """
+        Get the processed image downsampled by an integer factor.
+        
+        The original is box-averaged once per (revision, factor) and the
+        brightness/contrast window is applied to the small copy, so display
+        work scales with the preview size rather than the full image.
+        
+        Args:
+            factor: Downsampling factor; values <= 1 return the full-res image
+        """
+        if self.original_image is None:
+            return None
+        if factor <= 1:
+            return self.current_image
+        
+        revision, cached_factor, source = self._preview_source
+        if source is None or revision != self.revision or cached_factor != factor:
+            image = self._display_source()
+            h = image.shape[0] // factor
+            w = image.shape[1] // factor
+            blocks = image[:h * factor, :w * factor].reshape(h, factor, w, factor)
+            # uint8 or uint16; uint32 sums hold factor**2 16-bit values for
+            # any factor < 256
+            source = (blocks.sum(axis=(1, 3), dtype=np.uint32) // (factor * factor)).astype(image.dtype)
+            self._preview_source = (self.revision, factor, source)
+        
+        # The result is consumed (copied into the renderer's frame) before the
+        # next call, so one output buffer per preview size is enough
+        if self._preview_out is None or self._preview_out.shape != source.shape:
+            self._preview_out = np.empty(source.shape, dtype=np.uint8)
+        return apply_lut(source, self._get_lut(), self._preview_out)
+    
     def get_original_image(self) -> Optional[np.ndarray]:
         """Get the original image."""
         return self.original_image
@@ -311,3 +641,7 @@ class ImageProcessor:
     def get_dpi(self) -> Optional[Tuple[float, float]]:
         """Get the input DPI if available."""
         return self.input_dpi
+    
+    def get_metadata(self) -> Dict[str, object]:
+        """Get the loaded file's header metadata (format, mode, size, dpi) without reopening it."""
+        return self.source_metadata
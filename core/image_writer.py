@@ -0,0 +1,153 @@
+"""
+Image export module for TEM Image Editor.
+Writes rendered QImages to disk with DPI metadata, through Qt's own image
+writers where available and PIL otherwise.
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Tuple
+
+import PIL
+from PIL import Image
+from PyQt6.QtGui import QImage, QImageWriter
+
+# pillow-simd is a drop-in Pillow fork with SSE4/AVX2 kernels; its releases
+# are tagged X.Y.Z.postN. Only the PIL fallback below benefits from it.
+HAS_PILLOW_SIMD = ".post" in PIL.__version__
+
+# zlib level 1 encodes several times faster than Pillow's default of 6 and
+# costs only a few percent in file size on TEM images
+DEFAULT_PNG_COMPRESS_LEVEL = 1
+
+# JPEG quality 85 with optimized Huffman tables and progressive scans keeps
+# TEM images visually lossless at a fraction of the PNG size
+DEFAULT_JPEG_QUALITY = 85
+
+INCHES_PER_METER = 39.3700787
+
+# PIL's encoders write their output in small chunks; a 1 MiB file buffer
+# hands it to the OS in large writes instead, which matters on high-latency
+# SMB/NFS output folders
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _save_with_qt(q_image: QImage, file_path: str, dpi: Tuple[float, float],
+                  compress_level: int, jpeg_quality: int) -> bool:
+    """
+    Write through QImageWriter, straight from the QImage's pixels.
+
+    Returns:
+        False if Qt has no writer for the format (caller falls back to PIL)
+
+    Raises:
+        OSError: If the writer exists but fails
+    """
+    ext = Path(file_path).suffix.lower()
+    writer = QImageWriter(file_path, ext.lstrip(".").encode())
+    if not writer.canWrite():
+        return False
+
+    if ext == ".png":
+        writer.setCompression(compress_level)
+    elif ext in [".tif", ".tiff"]:
+        writer.setCompression(0)  # Uncompressed, like the PIL path
+    elif ext in [".jpg", ".jpeg"]:
+        writer.setQuality(jpeg_quality)
+        writer.setOptimizedWrite(True)
+        writer.setProgressiveScanWrite(True)
+
+    # Resolution travels as image metadata; this does not touch the pixels
+    q_image.setDotsPerMeterX(int(round(dpi[0] * INCHES_PER_METER)))
+    q_image.setDotsPerMeterY(int(round(dpi[1] * INCHES_PER_METER)))
+
+    if not writer.write(q_image):
+        raise OSError(writer.errorString())
+    return True
+
+
+def save_qimage(q_image: QImage, file_path: str, dpi: Tuple[float, float],
+                compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL,
+                jpeg_quality: int = DEFAULT_JPEG_QUALITY):
+    """
+    Save a rendered image, choosing the format from the file extension.
+
+    The file is encoded into a temporary sibling and renamed into place,
+    so the destination is never left half-written (cancelled batch, full
+    disk) and slow network shares only see one finished file appear.
+
+    Args:
+        q_image: Opaque image from OverlayRenderer.render_image_with_overlays
+        file_path: Destination path; .jpg/.jpeg/.bmp are saved as RGB,
+            everything else as RGBA (Grayscale8 frames may stay grayscale)
+        dpi: (x, y) resolution written to the file
+        compress_level: PNG zlib level, 0 (none) to 9 (smallest)
+        jpeg_quality: JPEG quality, 1 to 100
+    """
+    target = Path(file_path)
+    # Same directory (so the rename is atomic) and same extension (so both
+    # Qt and PIL still pick the format from it). The random part keeps two
+    # exports to the same path from sharing a temporary; unlike mkstemp the
+    # writer creates the file, so it gets the usual permissions.
+    tmp_path = target.with_name(f".{target.stem}.{uuid.uuid4().hex[:12]}.part{target.suffix}")
+    try:
+        _write_image(q_image, str(tmp_path), dpi, compress_level, jpeg_quality)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _write_image(q_image: QImage, file_path: str, dpi: Tuple[float, float],
+                 compress_level: int, jpeg_quality: int):
+    """Encode q_image to file_path with Qt, or PIL if Qt cannot."""
+    # Qt encodes directly from the premultiplied RGBA frame (dropping alpha
+    # itself for JPEG/BMP), skipping the numpy view and PIL image entirely
+    if _save_with_qt(q_image, file_path, dpi, compress_level, jpeg_quality):
+        return
+
+    ext = Path(file_path).suffix.lower()
+    print(f"No Qt writer for {ext}, encoding with "
+          f"{'pillow-simd' if HAS_PILLOW_SIMD else 'Pillow'} {PIL.__version__}")
+    if ext in [".jpg", ".jpeg", ".bmp"]:
+        # Formats without alpha: let Qt pack straight to RGB888 in one pass
+        # instead of building an RGBA image and converting it in PIL.
+        # frombuffer honours Qt's 4-byte row alignment via the stride, so
+        # the pixels are wrapped rather than copied.
+        q_export = q_image.convertToFormat(QImage.Format.Format_RGB888)
+        mode = 'RGB'
+    else:
+        # The renderer produces opaque premultiplied RGBA8888, which is
+        # byte-identical to straight RGBA, so this conversion is a no-op
+        # (overlay-free Grayscale8 frames are expanded here)
+        q_export = q_image.convertToFormat(QImage.Format.Format_RGBA8888_Premultiplied)
+        mode = 'RGBA'
+
+    # constBits() avoids the detach copy bits() would trigger. Neither the
+    # buffer nor the PIL image keeps q_export alive (the voidptr does not
+    # own it), so q_export must outlive both: it stays bound here and the
+    # PIL image is released before returning.
+    ptr = q_export.constBits()
+    ptr.setsize(q_export.sizeInBytes())
+    pil_image = Image.frombuffer(mode, (q_export.width(), q_export.height()), ptr,
+                                 'raw', mode, q_export.bytesPerLine(), 1)
+
+    # With a file object PIL cannot infer the format from the name
+    pil_format = Image.registered_extensions().get(ext)
+    if pil_format is None:
+        raise ValueError(f"Unsupported output format: {ext}")
+    with open(file_path, "wb", buffering=WRITE_BUFFER_SIZE) as fp:
+        if ext == ".png":
+            pil_image.save(fp, format="PNG", dpi=dpi,
+                           compress_level=compress_level, optimize=False)
+        elif pil_format == "JPEG":
+            pil_image.save(fp, format="JPEG", dpi=dpi, quality=jpeg_quality,
+                           optimize=True, progressive=True, subsampling=2)
+        else:
+            # TIFF is written uncompressed by Pillow, already the fastest path
+            pil_image.save(fp, format=pil_format, dpi=dpi)
+    del pil_image, ptr, q_export
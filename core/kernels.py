@@ -0,0 +1,243 @@
+"""
+Numerical kernels for TEM Image Editor.
+Per-pixel loops that are JIT-compiled with Numba (or handed to OpenCV) when
+installed, with NumPy fallbacks that produce the same result.
+"""
+
+import numpy as np
+
+# Try to import Numba for JIT acceleration
+try:
+    from numba import njit, prange  # type: ignore
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Try to import OpenCV for its SIMD (pshufb-based) 8-bit table lookup
+try:
+    import cv2  # type: ignore
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+# The parallel kernels below are compiled without nogil, so the calling thread
+# holds the GIL for the whole launch and two threads can never launch them at
+# once; Numba's portable "workqueue" threading layer (the only one on installs
+# without TBB or OpenMP) aborts the process if they did. Keep it that way, and
+# keep nogil kernels such as the TY6 decoder serial.
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)  # type: ignore
+    def _normalize_numba(src: np.ndarray, lo: float, span: float, out: np.ndarray) -> None:
+        """Numba JIT-compiled (src - lo) / span * 255, truncated to uint8, rows over all cores."""
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                # Divide first, as a reciprocal multiply can leave the
+                # maximum just below 255 and truncate it to 254
+                v = (src[i, j] - lo) / span * 255.0
+                if v < 0.0:
+                    v = 0.0
+                elif v > 255.0:
+                    v = 255.0
+                out[i, j] = np.uint8(v)
+
+    @njit(parallel=True, cache=True)  # type: ignore
+    def _apply_lut_numba(src: np.ndarray, lut: np.ndarray, out: np.ndarray) -> None:
+        """Numba JIT-compiled table gather, rows distributed over all cores."""
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                out[i, j] = lut[src[i, j]]
+
+    @njit(parallel=True, cache=True)  # type: ignore
+    def _gray_to_rgba_numba(src: np.ndarray, out: np.ndarray) -> None:
+        """Write each gray pixel to R, G and B in one pass; alpha is left alone."""
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                v = src[i, j]
+                out[i, j, 0] = v
+                out[i, j, 1] = v
+                out[i, j, 2] = v
+
+    @njit(parallel=True, cache=True)  # type: ignore
+    def _histogram_u8_numba(src: np.ndarray) -> np.ndarray:
+        """Rows split over chunks, each counting into its own 256-bin histogram."""
+        rows = src.shape[0]
+        n_chunks = min(rows, 64)
+        local = np.zeros((n_chunks, 256), dtype=np.int64)
+        for c in prange(n_chunks):
+            for i in range(c, rows, n_chunks):
+                for j in range(src.shape[1]):
+                    local[c, src[i, j]] += 1
+        hist = np.zeros(256, dtype=np.int64)
+        for c in range(n_chunks):
+            for k in range(256):
+                hist[k] += local[c, k]
+        return hist
+
+    @njit(parallel=True, cache=True)  # type: ignore
+    def _minmax_numba(src: np.ndarray):
+        """
+        Per-row min and max in one traversal, reduced over rows afterwards.
+
+        Also reports whether a NaN was seen (v != v), since comparisons
+        alone would silently skip it.
+        """
+        rows = src.shape[0]
+        row_min = np.empty(rows, dtype=src.dtype)
+        row_max = np.empty(rows, dtype=src.dtype)
+        row_nan = np.zeros(rows, dtype=np.bool_)
+        for i in prange(rows):
+            lo = src[i, 0]
+            hi = src[i, 0]
+            for j in range(src.shape[1]):
+                v = src[i, j]
+                if v < lo:
+                    lo = v
+                elif v > hi:
+                    hi = v
+                elif v != v:
+                    row_nan[i] = True
+            row_min[i] = lo
+            row_max[i] = hi
+        return row_min.min(), row_max.max(), row_nan.any()
+
+
+def gray_to_rgba(src: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Expand a 2D uint8 image into the RGB planes of an opaque RGBA buffer.
+
+    NumPy needs one strided pass per channel; OpenCV (contiguous input) and
+    Numba each do it in a single pass over the frame.
+
+    Args:
+        src: 2D uint8 image
+        out: (H, W, 4) uint8 buffer whose alpha plane is already 255
+
+    Returns:
+        out, with R = G = B = src
+    """
+    if HAS_CV2 and src.dtype == np.uint8 and src.flags.c_contiguous and out.flags.c_contiguous:
+        # Also writes alpha = 255, which out already holds
+        cv2.cvtColor(src, cv2.COLOR_GRAY2RGBA, dst=out)
+        return out
+    if HAS_NUMBA and src.dtype == np.uint8:
+        _gray_to_rgba_numba(src, out)
+        return out
+    out[..., 0] = src
+    out[..., 1] = src
+    out[..., 2] = src
+    return out
+
+
+def histogram_u8(src: np.ndarray) -> np.ndarray:
+    """
+    Return the 256-bin histogram of a 2D uint8 image.
+
+    np.bincount first converts its input to intp, an 8-bytes-per-pixel
+    copy; the Numba kernel counts straight from the uint8 pixels, on all
+    cores, with per-chunk histograms merged at the end.
+    """
+    if HAS_NUMBA and src.ndim == 2 and src.size > 0:
+        return _histogram_u8_numba(src)
+    return np.bincount(src.ravel(), minlength=256)
+
+
+def minmax(src: np.ndarray):
+    """
+    Return (min, max) of a 2D image.
+
+    With Numba both are found in a single pass over the pixels instead of
+    the two full scans np.min and np.max make. NaN propagates as in NumPy.
+    """
+    if HAS_NUMBA and src.ndim == 2 and src.size > 0 and src.dtype.isnative:
+        lo, hi, has_nan = _minmax_numba(src)
+        if has_nan:
+            return np.nan, np.nan
+        return lo, hi
+    return np.min(src), np.max(src)
+
+
+def apply_lut(src: np.ndarray, lut: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Map a 2D uint8 or uint16 image through a lookup table.
+
+    np.take runs on one core. With OpenCV, contiguous 8-bit images use its
+    SIMD table lookup; otherwise the Numba kernel spreads rows over all
+    cores, which is what a slider drag on a large image is bound by.
+    Flipped (negatively strided) sources are handled without a copy.
+
+    Args:
+        src: 2D uint8 or uint16 image
+        lut: uint8 table with an entry for every value in src
+        out: Preallocated uint8 array with the same shape as src
+
+    Returns:
+        out, filled with lut[src]
+    """
+    if (HAS_CV2 and src.dtype == np.uint8 and len(lut) == 256
+            and src.flags.c_contiguous and out.flags.c_contiguous):
+        # OpenCV's LUT is hand-vectorized (AVX2/NEON) and threaded; it needs
+        # positive strides, so flipped views go through Numba instead
+        cv2.LUT(src, lut, dst=out)
+        return out
+    if HAS_NUMBA and src.ndim == 2 and src.dtype.isnative:
+        _apply_lut_numba(src, lut, out)
+        return out
+    # np.take is already a single C gather into out. PIL's Image.point would
+    # be the same loop plus a new image and a copy back to NumPy.
+    return np.take(lut, src, out=out)
+
+
+def normalize_u8(src: np.ndarray, lo: float, hi: float, out: np.ndarray) -> np.ndarray:
+    """
+    Scale the full [lo, hi] range of a 2D image onto 0-255 uint8.
+
+    The range may be narrower than one level (float data), but hi must be
+    greater than lo. With Numba the subtract, scale, clip and cast are one
+    parallel pass; the NumPy fallback needs a float32 work array and five
+    passes over it.
+
+    Args:
+        src: 2D image of any integer or float dtype, typically raw_image
+        lo: Minimum of src, mapped to 0
+        hi: Maximum of src, mapped to 255
+        out: Preallocated uint8 array with the same shape as src
+
+    Returns:
+        out, filled with the normalized image
+    """
+    span = hi - lo
+    if HAS_NUMBA and src.ndim == 2 and src.dtype.isnative:
+        _normalize_numba(src, float(lo), float(span), out)
+        return out
+    # float32 holds every value of a <= 16-bit type exactly; wider types
+    # (int64, wide-range 32-bit) keep float64 so large offsets stay exact
+    work_dtype = np.float32 if src.dtype.itemsize <= 2 or src.dtype.kind == 'f' else np.float64
+    work = np.subtract(src, lo, dtype=work_dtype)
+    np.divide(work, span, out=work)
+    np.multiply(work, 255, out=work)
+    np.clip(work, 0, 255, out=work)
+    np.copyto(out, work, casting='unsafe')
+    return out
+
+
+def warmup():
+    """
+    Compile the Numba kernels for the dtypes the editor feeds them.
+
+    Compilation otherwise happens on the first slider drag. With
+    cache=True later launches load the compiled code from __pycache__.
+    No-op without Numba.
+    """
+    if not HAS_NUMBA:
+        return
+    out = np.empty((16, 16), dtype=np.uint8)
+    for dtype in (np.uint8, np.uint16, np.float32):
+        minmax(np.zeros((16, 16), dtype=dtype))
+    for dtype in (np.float32, np.float64):
+        normalize_u8(np.zeros((16, 16), dtype=dtype), 0, 1, out)
+    histogram_u8(np.zeros((16, 16), dtype=np.uint8))
+    gray_to_rgba(np.zeros((16, 16), dtype=np.uint8), np.zeros((16, 16, 4), dtype=np.uint8))
+    apply_lut(np.zeros((16, 16), dtype=np.uint8), np.zeros(256, dtype=np.uint8), out)
+    apply_lut(np.zeros((16, 16), dtype=np.uint16), np.zeros(65536, dtype=np.uint8), out)
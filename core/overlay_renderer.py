@@ -3,10 +3,19 @@ Overlay rendering module for TEM Image Editor.
 Handles drawing scalebar and aperture overlays on images.
 """
 
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
-from PyQt6.QtGui import QImage, QPainter, QPen, QBrush, QColor, QFont
-from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QImage, QPainter, QPen, QColor, QFont
+from PyQt6.QtCore import Qt, QRect, QRectF
+
+from .kernels import gray_to_rgba
+
+# Try to import OpenCV for rasterising the aperture circle
+try:
+    import cv2  # type: ignore
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
 
 
 class OverlayRenderer:
@@ -32,58 +41,213 @@ class OverlayRenderer:
         self.aperture_enabled = False
         self.aperture_nominal_size = 100  # diameter in µm
         self.aperture_color = QColor(255, 255, 0)
+        
+        # Persistent RGBA buffer backing the rendered QImage; reallocated only
+        # when the image size changes
+        self._rgba_scratch: Optional[np.ndarray] = None
+        # Grayscale frame backing the last overlay-free render
+        self._gray_source: Optional[np.ndarray] = None
+        # Whether the last render wrapped _rgba_scratch (see take_frame)
+        self._scratch_rendered = False
+        
+        # Cached transparent overlay layer: (key, RGBA buffer cropped to the
+        # drawn pixels, QImage view of it, its QRect in the frame or None if
+        # nothing was drawn). Rebuilt only when overlay settings, calibration
+        # or size change.
+        self._overlay_cache: Tuple = (None, None, None, None)
+    
+    def settings_key(self) -> tuple:
+        """
+        Hashable snapshot of every overlay setting.
+        
+        Callers caching rendered frames combine it with the image revision
+        and calibration, so their key cannot drift from what is drawn here.
+        """
+        return (
+            self.scalebar_enabled,
+            self.scalebar_length_value, self.scalebar_unit, self.scalebar_thickness,
+            self.scalebar_position, self.scalebar_label_override,
+            self.bar_color.rgba(), self.text_color.rgba(),
+            self.scalebar_font.toString() if isinstance(self.scalebar_font, QFont) else None,
+            self.scalebar_bg_enabled, self.scalebar_bg_color.rgba(), self.scalebar_bg_opacity,
+            self.aperture_enabled, self.aperture_nominal_size, self.aperture_color.rgba(),
+        )
+    
+    def _overlay_key(self, width: int, height: int, nm_per_pixel: float,
+                     overlay_scale: float) -> tuple:
+        """Key covering every input the overlay layer depends on."""
+        return (width, height, nm_per_pixel, overlay_scale) + self.settings_key()
+    
+    def render_overlay_layer(self, width: int, height: int, nm_per_pixel: float,
+                             overlay_scale: float = 1.0) -> Tuple[QImage, Optional[QRect]]:
+        """
+        Render the scalebar and aperture onto a transparent layer.
+        
+        The layer is cached and only redrawn when an overlay setting, the
+        calibration or the size changes, so a series of frames with the same
+        overlay (slider drags, a batch of same-sized images) pays for text
+        layout and anti-aliasing once.
+        
+        Returns:
+            (premultiplied RGBA QImage of the drawn pixels, its rect within
+            the frame, or (None, None) if the layer is empty). The image is
+            owned by the renderer.
+        """
+        key = self._overlay_key(width, height, nm_per_pixel, overlay_scale)
+        cached_key, _, layer_img, bounds = self._overlay_cache
+        if cached_key == key:
+            return layer_img, bounds
+        
+        layer = np.zeros((height, width, 4), dtype=np.uint8)
+        layer_img = QImage(layer.data, width, height, 4 * width,
+                           QImage.Format.Format_RGBA8888_Premultiplied)
+        
+        self._draw_scalebar(layer_img, layer, width, height, nm_per_pixel, overlay_scale)
+        if self.aperture_enabled:
+            self._draw_aperture(layer_img, layer, width, height, nm_per_pixel, overlay_scale)
+        
+        # Keep only the bounding box of the touched pixels: compositing only
+        # visits them, and the cache holds a scalebar-sized buffer instead of
+        # a full-frame one (64 MiB for a 4k x 4k image)
+        alpha = layer[..., 3]
+        rows = np.flatnonzero(alpha.any(axis=1))
+        if rows.size:
+            cols = np.flatnonzero(alpha.any(axis=0))
+            x0, y0 = int(cols[0]), int(rows[0])
+            w, h = int(cols[-1]) - x0 + 1, int(rows[-1]) - y0 + 1
+            # An explicit copy: a full-width crop is already contiguous, and
+            # ascontiguousarray would return a view pinning the whole layer
+            layer = layer[y0:y0 + h, x0:x0 + w].copy()
+            layer_img = QImage(layer.data, w, h, 4 * w,
+                               QImage.Format.Format_RGBA8888_Premultiplied)
+            bounds = QRect(x0, y0, w, h)
+        else:
+            layer, layer_img, bounds = None, None, None
+        
+        self._overlay_cache = (key, layer, layer_img, bounds)
+        return layer_img, bounds
     
     def render_image_with_overlays(self, 
                                    image: np.ndarray, 
-                                   nm_per_pixel: float) -> Optional[QImage]:
+                                   nm_per_pixel: float,
+                                   overlay_scale: float = 1.0) -> Optional[QImage]:
         """
         Render image with scalebar and aperture overlays.
         
         Args:
             image: The numpy array image to render
             nm_per_pixel: Calibration in nanometers per pixel
+            overlay_scale: Factor applied to pixel-sized overlay metrics
+                (margins, bar thickness, font, pen widths). Use 1/factor when
+                rendering a preview downsampled by factor so it matches export.
             
         Returns:
-            QImage with overlays drawn, or None if image is invalid
+            QImage with overlays drawn, or None if image is invalid. The image
+            shares the renderer's scratch buffer (or, for an 8-bit grayscale
+            frame with nothing to draw, the frame itself as Grayscale8) until
+            the next call.
         """
         if image is None:
             return None
         
-        # Prepare RGB image for painting
+        height, width = image.shape[:2]
+        
+        draws_overlay = self.scalebar_enabled and nm_per_pixel is not None and nm_per_pixel > 0
+        if not draws_overlay and image.ndim == 2 and image.dtype == np.uint8:
+            # Nothing to composite: hand Qt the grayscale frame as-is instead
+            # of expanding it to RGBA. Qt needs unit-stride rows, so a flipped
+            # view is compacted first; the reference keeps the pixels alive.
+            if image.strides[1] != 1 or image.strides[0] < width:
+                image = np.ascontiguousarray(image)
+            self._gray_source = image
+            self._scratch_rendered = False
+            return QImage(image.data, width, height, image.strides[0],
+                          QImage.Format.Format_Grayscale8)
+        
+        # Reuse the RGBA scratch buffer across renders. The overlay layer is
+        # composited SourceOver onto opaque pixels, so alpha stays 255 once set.
+        if self._rgba_scratch is None or self._rgba_scratch.shape[:2] != (height, width):
+            self._rgba_scratch = np.empty((height, width, 4), dtype=np.uint8)
+            self._rgba_scratch[..., 3] = 255
+        scratch = self._rgba_scratch
+        self._scratch_rendered = True
+        
         if len(image.shape) == 2:
-            # Convert grayscale to RGB using NumPy
-            rgb = np.stack([image, image, image], axis=-1)
+            # Expand grayscale into the RGB planes in a single pass
+            gray_to_rgba(image, scratch)
         else:
             # Already RGB/color
-            rgb = image
-        
-        # Ensure contiguous memory layout
-        rgb = np.ascontiguousarray(rgb)
-        height, width = rgb.shape[:2]
-        bytes_per_line = rgb.strides[0]
+            scratch[..., :3] = image[..., :3]
         
-        # Create QImage
-        qimg = QImage(rgb.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        qimg = qimg.copy().convertToFormat(QImage.Format.Format_ARGB32)
+        # Wrap the scratch buffer; the renderer keeps the strong reference.
+        # The returned QImage shares this buffer and is only valid until the
+        # next render, so callers that keep it must copy it.
+        # Every pixel is opaque, so tagging the buffer as premultiplied is
+        # exact and lets QPainter and QPixmap skip their premultiply passes.
+        qimg = QImage(scratch.data, width, height, 4 * width,
+                      QImage.Format.Format_RGBA8888_Premultiplied)
         
-        if not self.scalebar_enabled:
+        if not draws_overlay:
             return qimg
         
-        # Guard against invalid calibration
-        if nm_per_pixel is None or nm_per_pixel <= 0:
-            return qimg
+        # Composite the (cached) scalebar/aperture layer over its bounding box
+        layer_img, bounds = self.render_overlay_layer(width, height, nm_per_pixel, overlay_scale)
+        if bounds is not None:
+            painter = QPainter(qimg)
+            painter.drawImage(bounds.topLeft(), layer_img)
+            painter.end()
         
-        # Draw scalebar
-        self._draw_scalebar(qimg, width, height, nm_per_pixel)
+        return qimg
+    
+    def take_frame(self) -> Optional[np.ndarray]:
+        """
+        Hand over the RGBA buffer behind the last rendered QImage.
         
-        # Draw aperture if enabled
-        if self.aperture_enabled:
-            self._draw_aperture(qimg, width, height, nm_per_pixel)
+        The renderer allocates a fresh buffer on its next render, so a
+        caller holding the returned array can keep using that QImage (e.g.
+        on a worker thread) without copying it. Returns None if the last
+        render wrapped a grayscale frame instead, which the caller must copy.
+        """
+        if not self._scratch_rendered:
+            return None
+        frame = self._rgba_scratch
+        self._rgba_scratch = None
+        self._scratch_rendered = False
+        return frame
+    
+    def _fill_rect(self, buf: np.ndarray, x: int, y: int, w: int, h: int, color: QColor):
+        """
+        Fill an axis-aligned rectangle directly in a premultiplied RGBA buffer.
         
-        return qimg
+        Equivalent to a pen-less QPainter.drawRect with SourceOver, but a
+        slice write (or a blend over the slice) instead of a rasteriser pass.
+        """
+        height, width = buf.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        region = buf[y0:y1, x0:x1]
+        r, g, b, a = color.getRgb()
+        if a >= 255:
+            region[...] = (r, g, b, 255)
+        elif a > 0:
+            # Premultiplied SourceOver: out = src * a + dst * (1 - a)
+            src = np.array([(c * a + 127) // 255 for c in (r, g, b)] + [a], dtype=np.uint16)
+            blended = region.astype(np.uint16) * (255 - a)
+            blended += 127
+            blended //= 255
+            blended += src
+            region[...] = blended
     
-    def _draw_scalebar(self, qimg: QImage, width: int, height: int, nm_per_pixel: float):
+    def _draw_scalebar(self, qimg: QImage, buf: np.ndarray, width: int, height: int,
+                       nm_per_pixel: float, overlay_scale: float = 1.0):
         """Draw scalebar on the image."""
+        def px(value: float) -> int:
+            # Pixel metric at the current overlay scale
+            return max(1, int(round(value * overlay_scale)))
+        
         # Compute scalebar length in pixels
         if self.scalebar_unit == "µm":
             length_nm = self.scalebar_length_value * 1000.0
@@ -93,13 +257,15 @@ class OverlayRenderer:
         desired_px = int(round(length_nm / nm_per_pixel))
         
         # Cap scalebar length to fit within margins
-        margin = 30
+        margin = px(30)
+        thickness = px(self.scalebar_thickness)
+        gap = px(12)
         max_px = max(1, width - 2 * margin)
         scalebar_length_px = min(desired_px, max_px)
         
-        # Determine colors
-        bar_qcolor = QColor(self.bar_color)
-        text_qcolor = QColor(self.text_color)
+        # Determine colors; only read here, so no copies are needed
+        bar_qcolor = self.bar_color
+        text_qcolor = self.text_color
         
         # Compute outline color for text contrast
         r, g, b, *_ = text_qcolor.getRgb()
@@ -108,7 +274,7 @@ class OverlayRenderer:
         
         # Determine position
         if "bottom" in self.scalebar_position:
-            y = height - margin - self.scalebar_thickness
+            y = height - margin - thickness
         else:
             y = margin
         
@@ -134,7 +300,8 @@ class OverlayRenderer:
         unit_text = "µm" if self.scalebar_unit == "µm" else "nm"
         label = f"{label_value_text} {unit_text}"
         
-        # Start painting
+        # Start painting; QPainter is only used for the text, the rectangles
+        # are written straight into the buffer behind qimg
         painter = QPainter(qimg)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
@@ -142,11 +309,17 @@ class OverlayRenderer:
         # Font setup
         try:
             if isinstance(self.scalebar_font, QFont):
-                painter.setFont(self.scalebar_font)
+                font = QFont(self.scalebar_font)
             else:
-                painter.setFont(QFont("Arial", 20))
+                font = QFont("Arial", 20)
         except Exception:
-            painter.setFont(QFont("Arial", 20))
+            font = QFont("Arial", 20)
+        if overlay_scale != 1.0:
+            if font.pointSizeF() > 0:
+                font.setPointSizeF(font.pointSizeF() * overlay_scale)
+            else:
+                font.setPixelSize(px(font.pixelSize()))
+        painter.setFont(font)
         
         fm = painter.fontMetrics()
         text_width = fm.horizontalAdvance(label)
@@ -156,12 +329,12 @@ class OverlayRenderer:
         
         # Text position
         if "bottom" in self.scalebar_position:
-            text_baseline_y = y - 12  # 12px gap
+            text_baseline_y = y - gap  # 12px gap at full scale
             text_top = text_baseline_y - ascent
             text_bottom = text_baseline_y + descent
         else:
-            text_baseline_y = y + self.scalebar_thickness + ascent + 12
-            text_top = y + self.scalebar_thickness + 12
+            text_baseline_y = y + thickness + ascent + gap
+            text_top = y + thickness + gap
             text_bottom = text_baseline_y + descent
         
         # Center label horizontally over the bar
@@ -170,11 +343,11 @@ class OverlayRenderer:
         
         # Optional background box
         if self.scalebar_bg_enabled:
-            pad = 6
+            pad = px(6)
             rect_left = min(x, text_x) - pad
             rect_right = max(x + scalebar_length_px, text_x + text_width) + pad
             rect_top = min(y, text_top)
-            rect_bottom = max(y + self.scalebar_thickness, text_bottom) + pad
+            rect_bottom = max(y + thickness, text_bottom) + pad
             rect_left = max(0, rect_left)
             rect_top = max(0, rect_top)
             rect_right = min(width - 1, rect_right)
@@ -182,17 +355,15 @@ class OverlayRenderer:
             
             bg = QColor(self.scalebar_bg_color)
             bg.setAlpha(self.scalebar_bg_opacity)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QBrush(bg))
-            painter.drawRect(int(rect_left), int(rect_top), 
-                           int(rect_right - rect_left), int(rect_bottom - rect_top))
+            self._fill_rect(buf, int(rect_left), int(rect_top),
+                            int(rect_right - rect_left), int(rect_bottom - rect_top), bg)
         
         # Draw scalebar rectangle
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(bar_qcolor))
-        painter.drawRect(x, y, scalebar_length_px, self.scalebar_thickness)
+        self._fill_rect(buf, x, y, scalebar_length_px, thickness, bar_qcolor)
         
-        # Draw text with outline
+        # Draw text with outline. drawText ignores the pen width, so this
+        # pass only tints the glyphs' anti-aliased edges under the foreground
+        # text; it is kept so exported labels stay pixel-identical.
         pen = QPen(outline_qcolor)
         pen.setWidth(3)
         painter.setPen(pen)
@@ -205,7 +376,8 @@ class OverlayRenderer:
         
         painter.end()
     
-    def _draw_aperture(self, qimg: QImage, width: int, height: int, nm_per_pixel: float):
+    def _draw_aperture(self, qimg: QImage, buf: np.ndarray, width: int, height: int,
+                       nm_per_pixel: float, overlay_scale: float = 1.0):
         """Draw aperture overlay on the image."""
         if nm_per_pixel is None or nm_per_pixel <= 0:
             return
@@ -221,6 +393,29 @@ class OverlayRenderer:
         center_x = width // 2
         center_y = height // 2
         
+        pen_width_px = 5.0 * overlay_scale
+        
+        r, g, b, a = self.aperture_color.getRgb()
+        if HAS_CV2 and a >= 255:
+            # OpenCV rasterises the anti-aliased ring straight into the RGBA
+            # buffer. Its coverage blend on all four channels yields correct
+            # premultiplied pixels. The stroke is centred on the radius like
+            # Qt's, so the same half-width expansion keeps the inner diameter;
+            # shift=4 keeps 1/16 px precision for centre and radius.
+            thickness = max(1, int(round(pen_width_px)))
+            radius_px = target_inner_radius_px + thickness / 2.0
+            shift = 4
+            cv2.circle(
+                buf,
+                (center_x << shift, center_y << shift),
+                int(round(radius_px * (1 << shift))),
+                (r, g, b, 255),
+                thickness=thickness,
+                lineType=cv2.LINE_AA,
+                shift=shift,
+            )
+            return
+        
         # Draw circle
         painter = QPainter(qimg)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
@@ -230,7 +425,6 @@ class OverlayRenderer:
         # is inside the path and half is outside. To keep the INNER diameter
         # equal to the requested apparent diameter, expand the ellipse radius
         # by pen_width/2.
-        pen_width_px = 5.0
         pen = QPen(self.aperture_color)
         try:
             pen.setWidthF(pen_width_px)
@@ -18,11 +18,15 @@ Copyright (c) 2025, Robert Buecker
 License: BSD 3-clause
 """
 
+import functools
+import mmap
+import multiprocessing as mp
 import os
 import re
 import struct
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from typing import Dict, Tuple, Union, Optional
+from typing import Dict, List, Sequence, Tuple, Union, Optional
 
 # Try to import the C++ decompression function from dxtbx if available
 try:
@@ -39,19 +43,90 @@ except ImportError:
     HAS_NUMBA = False
 
 
+def _prefetch(fd: int) -> None:
+    """
+    Ask the OS to start reading the whole file into the page cache.
+
+    The read-ahead runs in the background while the headers are parsed, so
+    the large compressed-data read that follows is mostly served from
+    memory on a cold cache. Silently does nothing where posix_fadvise is
+    unavailable (Windows, macOS).
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+
+# The ASCII header, then the general (512), special (768) and KM4 goniometer
+# (1024 bytes) sections of the binary header
+ASCII_HEADER_NBYTES = 256
+BINARY_HEADER_NBYTES = 512 + 768 + 1024
+
+# NAME=value size definitions of the ASCII header; values may be padded
+# with spaces after the '=', so a plain whitespace split would not do
+_ASCII_DEFINITION = re.compile(r"([A-Z]+)=([ 0-9]+)")
+
+# Binary header field layouts, compiled once instead of on every unpack
+_S_HH = struct.Struct("<hh")
+_S_HHHH = struct.Struct("<hhhh")
+_S_I = struct.Struct("<I")
+_S_L = struct.Struct("<l")
+_S_D = struct.Struct("<d")
+_S_DD = struct.Struct("<dd")
+_S_DDD = struct.Struct("<ddd")
+_S_DDDD = struct.Struct("<dddd")
+_S_L10 = struct.Struct("<10l")
+_S_D10 = struct.Struct("<10d")
+
+# Value mask and bias of a TY6 sub-block, indexed by its 4-bit width code;
+# read as constants by the Numba decoder instead of shifting per block
+_TY6_MASK = np.array([(1 << n) - 1 for n in range(16)], dtype=np.int64)
+_TY6_ZERO_AT = np.array([(1 << (n - 1)) - 1 if n > 1 else 0 for n in range(16)], dtype=np.int64)
+
+
 # Numba-accelerated TY6 decompression functions
 if HAS_NUMBA:
+    @jit(nopython=True, cache=True, inline='always')  # type: ignore
+    def _read_i16_le(buf: np.ndarray, i: int) -> np.int32:
+        """
+        Little-endian int16 at byte i, widened to int32.
+        
+        The escape values sit at arbitrary byte offsets, so they cannot be
+        read through an aligned uint16 view; LLVM merges the adjacent byte
+        loads into one unaligned load, and the casts sign-extend without
+        the branch a '>= 32768' correction needs.
+        """
+        return np.int32(np.int16(np.uint16(buf[i] | (buf[i + 1] << 8))))
+
+    @jit(nopython=True, cache=True, inline='always')  # type: ignore
+    def _read_i32_le(buf: np.ndarray, i: int) -> np.int32:
+        """Little-endian int32 at byte i; see _read_i16_le."""
+        return np.int32(np.uint32(buf[i] | (buf[i + 1] << 8) |
+                                  (buf[i + 2] << 16) | (buf[i + 3] << 24)))
+
+    @jit(nopython=True, cache=True, inline='always')  # type: ignore
+    def _read_u64_le(buf: np.ndarray, i: int) -> np.int64:
+        """Eight little-endian bytes at byte i as one 64-bit field; see _read_i16_le."""
+        v = np.int64(0)
+        for k in range(8):
+            v |= np.int64(buf[i + k]) << (8 * k)
+        return v
+
     @jit(nopython=True, cache=True)  # type: ignore
-    def _decode_ty6_oneline_numba(linedata: np.ndarray, w: int) -> np.ndarray:
+    def _decode_ty6_oneline_into(linedata: np.ndarray, w: int, out: np.ndarray) -> None:
         """
         Numba JIT-compiled version of TY6 line decompression.
         
+        Decodes straight into the caller's image row, so no per-line array
+        is allocated and copied.
+        
         Args:
             linedata: Raw line data as uint8 array
             w: Number of pixels in the fast axis
-            
-        Returns:
-            Decompressed pixel values for the line
+            out: int32 array of length w receiving the pixel values
         """
         BLOCKSIZE = 8
         SHORT_OVERFLOW = 254
@@ -61,159 +136,132 @@ if HAS_NUMBA:
 
         ipos = 0
         opos = 0
-        ret = np.zeros(w, dtype=np.int32)
 
         nblock = (w - 1) // (BLOCKSIZE * 2)
         nrest = (w - 1) % (BLOCKSIZE * 2)
 
         # Decode first pixel
-        firstpx = int(linedata[ipos])
+        firstpx = np.int32(linedata[ipos])
         ipos += 1
         if firstpx < SHORT_OVERFLOW:
-            ret[opos] = firstpx - 127
+            out[opos] = firstpx - 127
         elif firstpx == LONG_OVERFLOW:
-            # Manually reconstruct int32 from bytes
-            ret[opos] = (linedata[ipos] | 
-                        (linedata[ipos + 1] << 8) | 
-                        (linedata[ipos + 2] << 16) | 
-                        (linedata[ipos + 3] << 24))
-            # Handle signed integer overflow
-            if ret[opos] >= 2147483648:
-                ret[opos] -= 4294967296
+            out[opos] = _read_i32_le(linedata, ipos)
             ipos += 4
         else:
-            # Manually reconstruct int16 from bytes
-            val = linedata[ipos] | (linedata[ipos + 1] << 8)
-            # Handle signed integer overflow for int16
-            if val >= 32768:
-                val -= 65536
-            ret[opos] = val
+            out[opos] = _read_i16_le(linedata, ipos)
             ipos += 2
         opos += 1
 
         # Decode blocks
         for k in range(nblock):
-            bittype = int(linedata[ipos])
+            bittype = np.int32(linedata[ipos])
             nbit1 = bittype & 15
             nbit2 = (bittype >> 4) & 15
             ipos += 1
 
-            # Process first sub-block
-            zero_at1 = 0
-            if nbit1 > 1:
-                zero_at1 = (1 << (nbit1 - 1)) - 1
-
-            v1 = 0
-            for j in range(nbit1):
-                v1 |= int(linedata[ipos]) << (8 * j)
-                ipos += 1
-
-            mask1 = (1 << nbit1) - 1
-            for j in range(BLOCKSIZE):
-                val = ((v1 >> (nbit1 * j)) & mask1) - zero_at1
-                ret[opos] = np.int32(val)
-                opos += 1
-
-            # Process second sub-block
-            zero_at2 = 0
-            if nbit2 > 1:
-                zero_at2 = (1 << (nbit2 - 1)) - 1
-
-            v2 = 0
-            for j in range(nbit2):
-                v2 |= int(linedata[ipos]) << (8 * j)
-                ipos += 1
-
-            mask2 = (1 << nbit2) - 1
-            for j in range(BLOCKSIZE):
-                val = ((v2 >> (nbit2 * j)) & mask2) - zero_at2
-                ret[opos] = np.int32(val)
-                opos += 1
-
-            # Apply delta encoding to the entire block
+            # Process both sub-blocks
+            for half in range(2):
+                nbit = nbit1 if half == 0 else nbit2
+                zero_at = _TY6_ZERO_AT[nbit]
+                mask = _TY6_MASK[nbit]
+
+                # The 8 values are packed into exactly nbit bytes (at most 8,
+                # as in the reference decoder). Away from the end of the line
+                # all 8 bytes are loaded at once; bits past the sub-block are
+                # never extracted.
+                if ipos + 8 <= len(linedata):
+                    v = _read_u64_le(linedata, ipos)
+                else:
+                    v = 0
+                    for j in range(nbit):
+                        v |= np.int64(linedata[ipos + j]) << (8 * j)
+                ipos += nbit
+
+                for j in range(BLOCKSIZE):
+                    out[opos] = np.int32(((v >> (nbit * j)) & mask) - zero_at)
+                    opos += 1
+
+            # Resolve escaped deltas of the block
             block_start = opos - BLOCKSIZE * 2
             for i in range(block_start, opos):
-                offset = ret[i]
+                offset = out[i]
 
                 if offset >= SHORT_OVERFLOW_SIGNED:
                     if offset >= LONG_OVERFLOW_SIGNED:
-                        # Manually reconstruct int32 from bytes
-                        offset_val = (linedata[ipos] | 
-                                    (linedata[ipos + 1] << 8) | 
-                                    (linedata[ipos + 2] << 16) | 
-                                    (linedata[ipos + 3] << 24))
-                        # Handle signed integer overflow
-                        if offset_val >= 2147483648:
-                            offset_val -= 4294967296
-                        offset = offset_val
+                        out[i] = _read_i32_le(linedata, ipos)
                         ipos += 4
                     else:
-                        # Manually reconstruct int16 from bytes
-                        val = linedata[ipos] | (linedata[ipos + 1] << 8)
-                        # Handle signed integer overflow for int16
-                        if val >= 32768:
-                            val -= 65536
-                        offset = val
+                        out[i] = _read_i16_le(linedata, ipos)
                         ipos += 2
 
-                ret[i] = ret[i - 1] + offset
-
-        # Decode remaining pixels
+        # Decode remaining deltas
         for i in range(nrest):
-            px = int(linedata[ipos])
+            px = np.int32(linedata[ipos])
             ipos += 1
             if px < SHORT_OVERFLOW:
-                ret[opos] = ret[opos - 1] + px - 127
+                out[opos] = px - 127
             elif px == LONG_OVERFLOW:
-                # Manually reconstruct int32 from bytes
-                val = (linedata[ipos] | 
-                      (linedata[ipos + 1] << 8) | 
-                      (linedata[ipos + 2] << 16) | 
-                      (linedata[ipos + 3] << 24))
-                # Handle signed integer overflow
-                if val >= 2147483648:
-                    val -= 4294967296
-                ret[opos] = ret[opos - 1] + val
+                out[opos] = _read_i32_le(linedata, ipos)
                 ipos += 4
             else:
-                # Manually reconstruct int16 from bytes
-                val = linedata[ipos] | (linedata[ipos + 1] << 8)
-                # Handle signed integer overflow for int16
-                if val >= 32768:
-                    val -= 65536
-                ret[opos] = ret[opos - 1] + val
+                out[opos] = _read_i16_le(linedata, ipos)
                 ipos += 2
             opos += 1
 
-        return ret
+        # out now holds the first pixel followed by deltas. Summing them in
+        # one pass at the end, instead of interleaved with the byte parsing,
+        # keeps the dependency chain in a tight loop of its own.
+        for i in range(1, w):
+            out[i] += out[i - 1]
 
-    @jit(nopython=True, cache=True)  # type: ignore
+    @jit(nopython=True, cache=True, nogil=True)  # type: ignore
     def _decode_ty6_image_numba(linedata: np.ndarray, offsets: np.ndarray, 
                                ny: int, nx: int) -> np.ndarray:
         """
         Numba JIT-compiled version of full TY6 image decompression.
         
+        Runs on one thread without the GIL. It is deliberately not
+        parallel: the editor decodes on a loader thread while the GUI thread
+        runs the parallel display kernels (see core.kernels), and Numba's
+        portable workqueue threading layer aborts on concurrent parallel
+        launches. Serial decoding also keeps read_rod_images workers at one
+        thread each.
+        
         Args:
             linedata: Raw compressed data as uint8 array
-            offsets: Line offset positions as uint32 array
+            offsets: Line start positions as uint32 array, followed by one
+                final entry holding len(linedata)
             ny: Number of lines (height)
             nx: Number of pixels per line (width)
             
         Returns:
             Decompressed image as 2D int32 array
         """
-        image = np.zeros((ny, nx), dtype=np.int32)
+        image = np.empty((ny, nx), dtype=np.int32)
         for iy in range(ny):
-            line_start = offsets[iy]
-            if iy < ny - 1:
-                line_end = offsets[iy + 1]
-                line_slice = linedata[line_start:line_end]
-            else:
-                line_slice = linedata[line_start:]
-            image[iy, :] = _decode_ty6_oneline_numba(line_slice, nx)
+            line_slice = linedata[offsets[iy]:offsets[iy + 1]]
+            _decode_ty6_oneline_into(line_slice, nx, image[iy])
         return image
 
 
+def warmup() -> None:
+    """
+    Compile the Numba TY6 decoder ahead of the first .rodhypix load.
+
+    Decodes a one-pixel image with the same argument types a real file
+    produces, so compilation (or, with cache=True, loading the compiled
+    code from __pycache__) does not delay opening the first image.
+    No-op without Numba.
+    """
+    if not HAS_NUMBA:
+        return
+    # Read-only like the memory-mapped data, which Numba compiles separately
+    linedata = np.array([127], dtype=np.uint8)
+    linedata.setflags(write=False)
+    _decode_ty6_image_numba(linedata, np.array([0, 1], dtype=np.uint32), 1, 1)
+
+
 class RODImageReader:
     """
     Minimal reader for Rigaku Oxford Diffraction image files.
@@ -236,12 +284,20 @@ class RODImageReader:
         self.use_cpp = use_cpp and HAS_CPP_DECOMPRESSION
         self.use_numba = use_numba and HAS_NUMBA
         
-        if not self.understand(self.image_file):
+        # One open for the format check and both headers, which matters on
+        # network shares where every open is a round trip
+        try:
+            with open(self.image_file, "rb") as f:
+                _prefetch(f.fileno())
+                header = f.read(ASCII_HEADER_NBYTES + BINARY_HEADER_NBYTES)
+        except OSError as e:
+            raise ValueError(f"File {self.image_file} is not a valid ROD format") from e
+        if not self._understand_header(header):
             raise ValueError(f"File {self.image_file} is not a valid ROD format")
             
         self._txt_header: Optional[Dict] = None
         self._bin_header: Optional[Dict] = None
-        self._read_headers()
+        self._read_headers(header)
     
     @staticmethod
     def understand(image_file: Union[str, os.PathLike]) -> bool:
@@ -256,8 +312,17 @@ class RODImageReader:
         """
         try:
             with open(image_file, "rb") as f:
-                hdr = f.read(256).decode("ascii")
-        except (OSError, UnicodeDecodeError):
+                header = f.read(ASCII_HEADER_NBYTES)
+        except OSError:
+            return False
+        return RODImageReader._understand_header(header)
+    
+    @staticmethod
+    def _understand_header(header: bytes) -> bool:
+        """Check the signature in the leading ASCII header bytes of a file."""
+        try:
+            hdr = header[:ASCII_HEADER_NBYTES].decode("ascii")
+        except UnicodeDecodeError:
             return False
 
         lines = hdr.splitlines()
@@ -274,16 +339,15 @@ class RODImageReader:
 
         return True
     
-    def _read_headers(self) -> None:
-        """Read both ASCII and binary headers."""
-        self._txt_header = self._read_ascii_header()
-        self._bin_header = self._read_binary_header()
+    def _read_headers(self, header: bytes) -> None:
+        """Parse both ASCII and binary headers from the leading bytes of the file."""
+        self._txt_header = self._read_ascii_header(header)
+        self._bin_header = self._read_binary_header(header)
     
-    def _read_ascii_header(self) -> Dict:
-        """Read the ASCII header comprising the first 256 bytes of the file."""
+    def _read_ascii_header(self, header: bytes) -> Dict:
+        """Parse the ASCII header comprising the first 256 bytes of the file."""
         hd = {}
-        with open(self.image_file, "rb") as f:
-            hdr = f.read(256).decode("ascii")
+        hdr = header[:ASCII_HEADER_NBYTES].decode("ascii")
         lines = hdr.splitlines()
 
         vers = lines[0].split()
@@ -296,79 +360,58 @@ class RODImageReader:
             raise ValueError("Wrong header format")
         hd["compression"] = compression[1]
 
-        # Extract definitions from the 3rd - 5th line
-        defn = re.compile(r"([A-Z]+=[ 0-9]+)")
-        for line in lines[2:5]:
-            sizes = defn.findall(line)
-            for s in sizes:
-                n, v = s.split("=")
-                hd[n] = int(v)
+        # Extract definitions from the 3rd - 5th line in one scan
+        for n, v in _ASCII_DEFINITION.findall("\n".join(lines[2:5])):
+            hd[n] = int(v)
 
         hd["time"] = lines[5].split("TIME=")[-1].strip("\x1a").rstrip()
 
         return hd
     
-    def _read_binary_header(self) -> Dict:
-        """Read the most relevant parameters from the binary header."""
-        offset = 256
+    def _read_binary_header(self, header: bytes) -> Dict:
+        """Parse the most relevant parameters from the binary header."""
         general_nbytes = 512
         special_nbytes = 768
-        km4gonio_nbytes = 1024
         
-        with open(self.image_file, "rb") as f:
-            # General section
-            f.seek(offset)
-            bin_x, bin_y = struct.unpack("<hh", f.read(4))
-            f.seek(offset + 22)
-            chip_npx_x, chip_npx_y, im_npx_x, im_npx_y = struct.unpack(
-                "<hhhh", f.read(8)
-            )
-            f.seek(offset + 36)
-            num_points = struct.unpack("<I", f.read(4))[0]
-            if num_points != im_npx_x * im_npx_y:
-                raise ValueError("Cannot interpret binary header")
-
-            # Special section
-            f.seek(offset + general_nbytes + 56)
-            gain = struct.unpack("<d", f.read(8))[0]
-            f.seek(offset + general_nbytes + 464)
-            overflow_flag, overflow_after_remeasure_flag = struct.unpack(
-                "<hh", f.read(4)
-            )
-            f.seek(offset + general_nbytes + 472)
-            overflow_threshold = struct.unpack("<l", f.read(4))[0]
-            f.seek(offset + general_nbytes + 480)
-            exposure_time_sec, overflow_time_sec = struct.unpack("<dd", f.read(16))
-            f.seek(offset + general_nbytes + 548)
-            detector_type = struct.unpack("<l", f.read(4))[0]
-            f.seek(offset + general_nbytes + 568)
-            real_px_size_x, real_px_size_y = struct.unpack("<dd", f.read(16))
-
-            # Goniometer section
-            f.seek(offset + general_nbytes + special_nbytes + 284)
-            # angles for OMEGA, THETA, CHI(=KAPPA), PHI,
-            # OMEGA_PRIME (also called DETECTOR_AXIS; what's this?), THETA_PRIME
-            start_angles_steps = struct.unpack("<llllllllll", f.read(40))
-            end_angles_steps = struct.unpack("<llllllllll", f.read(40))
-            f.seek(offset + general_nbytes + special_nbytes + 368)
-            step_to_rad = struct.unpack("<dddddddddd", f.read(80))
-            f.seek(offset + general_nbytes + special_nbytes + 552)
-            # FIXME: I don't know what these are. Isn't the beam along e1 by definition??
-            beam_rotn_around_e2, beam_rotn_around_e3 = struct.unpack("<dd", f.read(16))
-            alpha1_wavelength = struct.unpack("<d", f.read(8))[0]
-            alpha2_wavelength = struct.unpack("<d", f.read(8))[0]
-            alpha12_wavelength = struct.unpack("<d", f.read(8))[0]
-            f.seek(offset + general_nbytes + special_nbytes + 640)
-            # detector rotation in degrees along e1, e2, e3
-            detector_rotns = struct.unpack("<ddd", f.read(24))
-            # direct beam position when all angles are zero (FIXME: not completely sure)
-            origin_px_x, origin_px_y = struct.unpack("<dd", f.read(16))
-            # alpha and beta are angles between KAPPA(=CHI) and THETA, and e3.
-            angles_in_deg = struct.unpack(
-                "<dddd", f.read(32)
-            )  # alpha, beta, gamma, delta
-            f.seek(offset + general_nbytes + special_nbytes + 712)
-            distance_mm = struct.unpack("<d", f.read(8))[0]
+        # All fields lie in one contiguous block after the ASCII header, read
+        # together with it; unpack them at fixed offsets
+        buf = memoryview(header)[ASCII_HEADER_NBYTES:]
+
+        # General section
+        bin_x, bin_y = _S_HH.unpack_from(buf, 0)
+        chip_npx_x, chip_npx_y, im_npx_x, im_npx_y = _S_HHHH.unpack_from(buf, 22)
+        num_points = _S_I.unpack_from(buf, 36)[0]
+        if num_points != im_npx_x * im_npx_y:
+            raise ValueError("Cannot interpret binary header")
+
+        # Special section
+        special = general_nbytes
+        gain = _S_D.unpack_from(buf, special + 56)[0]
+        overflow_flag, overflow_after_remeasure_flag = _S_HH.unpack_from(buf, special + 464)
+        overflow_threshold = _S_L.unpack_from(buf, special + 472)[0]
+        exposure_time_sec, overflow_time_sec = _S_DD.unpack_from(buf, special + 480)
+        detector_type = _S_L.unpack_from(buf, special + 548)[0]
+        real_px_size_x, real_px_size_y = _S_DD.unpack_from(buf, special + 568)
+
+        # Goniometer section
+        gonio = general_nbytes + special_nbytes
+        # angles for OMEGA, THETA, CHI(=KAPPA), PHI,
+        # OMEGA_PRIME (also called DETECTOR_AXIS; what's this?), THETA_PRIME
+        start_angles_steps = _S_L10.unpack_from(buf, gonio + 284)
+        end_angles_steps = _S_L10.unpack_from(buf, gonio + 324)
+        step_to_rad = _S_D10.unpack_from(buf, gonio + 368)
+        # FIXME: I don't know what these are. Isn't the beam along e1 by definition??
+        beam_rotn_around_e2, beam_rotn_around_e3 = _S_DD.unpack_from(buf, gonio + 552)
+        alpha1_wavelength = _S_D.unpack_from(buf, gonio + 568)[0]
+        alpha2_wavelength = _S_D.unpack_from(buf, gonio + 576)[0]
+        alpha12_wavelength = _S_D.unpack_from(buf, gonio + 584)[0]
+        # detector rotation in degrees along e1, e2, e3
+        detector_rotns = _S_DDD.unpack_from(buf, gonio + 640)
+        # direct beam position when all angles are zero (FIXME: not completely sure)
+        origin_px_x, origin_px_y = _S_DD.unpack_from(buf, gonio + 664)
+        # alpha and beta are angles between KAPPA(=CHI) and THETA, and e3.
+        angles_in_deg = _S_DDDD.unpack_from(buf, gonio + 680)  # alpha, beta, gamma, delta
+        distance_mm = _S_D.unpack_from(buf, gonio + 712)[0]
 
         return {
             "bin_x": bin_x,
@@ -594,14 +637,30 @@ class RODImageReader:
         nx = self._txt_header["NX"]
         ny = self._txt_header["NY"]
         
-        with open(self.image_file, "rb") as f:
-            f.seek(offset)
-            lbytesincompressedfield = struct.unpack("<l", f.read(4))[0]
-            linedata = np.fromfile(f, dtype=np.uint8, count=lbytesincompressedfield)
-            offsets_raw = f.read(4 * ny)
-            offsets = np.frombuffer(offsets_raw, dtype=np.uint32)
-
-            return _decode_ty6_image_numba(linedata, offsets, ny, nx)
+        # Decode straight from a memory map of the file: pages are faulted
+        # in as the decoder reaches them (and were already queued
+        # for read-ahead by _prefetch), instead of reading the whole
+        # compressed field into a copy before decoding starts
+        with open(self.image_file, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lbytesincompressedfield = _S_L.unpack_from(mm, offset)[0]
+            data_start = offset + 4
+            linedata = np.frombuffer(mm, dtype=np.uint8, count=lbytesincompressedfield,
+                                     offset=data_start)
+            try:
+                # Terminate the table with the data length, so the last line's
+                # end is looked up like every other line's
+                offsets = np.empty(ny + 1, dtype=np.uint32)
+                offsets[:ny] = np.frombuffer(mm, dtype='<u4', count=ny,
+                                             offset=data_start + lbytesincompressedfield)
+                offsets[ny] = lbytesincompressedfield
+
+                image = _decode_ty6_image_numba(linedata, offsets, ny, nx)
+            finally:
+                # The map cannot close while an array still exports its
+                # buffer, which would mask a decode error with BufferError
+                del linedata
+        return image
     
     def get_decompression_method(self) -> str:
         """
@@ -648,6 +707,43 @@ def read_rod_image(filename: Union[str, os.PathLike],
     return reader.get_raw_data()
 
 
+def _init_batch_worker() -> None:
+    """Prepare a read_rod_images worker process."""
+    warmup()
+
+
+def read_rod_images(filenames: Sequence[Union[str, os.PathLike]],
+                    workers: Optional[int] = None,
+                    use_cpp: bool = True, use_numba: bool = True) -> List[np.ndarray]:
+    """
+    Read several ROD image files in parallel worker processes.
+    
+    Each file is decoded by one process, so a rotation series is decoded on
+    all cores instead of one file after another.
+    
+    Args:
+        filenames: Paths to the .rodhypix files
+        workers: Number of processes (default: one per CPU)
+        use_cpp: Use C++ decompression if available (default True)
+        use_numba: Use Numba JIT decompression if available (default True, fallback from C++)
+        
+    Returns:
+        2D NumPy arrays with the image data, in the order of filenames
+    """
+    paths = [os.fspath(f) for f in filenames]
+    if not paths:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    # Several files per task amortize the round trips for long series
+    chunksize = max(1, len(paths) // (4 * workers))
+    read = functools.partial(read_rod_image, use_cpp=use_cpp, use_numba=use_numba)
+    # spawn: Numba's threading layer is not safe to fork once initialized
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=mp.get_context("spawn"),
+                             initializer=_init_batch_worker) as executor:
+        return list(executor.map(read, paths, chunksize=chunksize))
+
+
 def get_rod_info(filename: Union[str, os.PathLike]) -> Dict:
     """
     Get header information from a ROD image file.
@@ -0,0 +1,69 @@
+"""
+Background workers for TEM Image Editor.
+QRunnable tasks that keep slow work off the GUI thread.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from core.image_processor import ImageProcessor
+from core.image_writer import save_qimage
+
+
+class LoadImageSignals(QObject):
+    """Signals emitted by LoadImageTask."""
+    # (file_path, processor, (success, error_message, dimensions, pixel_metadata))
+    finished = pyqtSignal(str, object, tuple)
+
+
+class LoadImageTask(QRunnable):
+    """Load an image into a fresh ImageProcessor on a worker thread.
+
+    A new processor is used so the GUI thread can keep rendering the
+    current image until the result is delivered via the finished signal.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = LoadImageSignals()
+
+    def run(self):
+        processor = ImageProcessor()
+        result = processor.load_image(self.file_path)
+        self.signals.finished.emit(self.file_path, processor, result)
+
+
+class SaveImageSignals(QObject):
+    """Signals emitted by SaveImageTask."""
+    # (file_path, error_message or None on success)
+    finished = pyqtSignal(str, object)
+
+
+class SaveImageTask(QRunnable):
+    """Encode and write a rendered image on a worker thread.
+
+    The QImage's pixels must not change while the task runs, since the GUI
+    thread keeps rendering meanwhile: pass a copy, or the frame buffer
+    taken from the renderer (OverlayRenderer.take_frame) as buffer.
+    """
+
+    def __init__(self, q_image: QImage, file_path: str, dpi: Tuple[float, float],
+                 buffer: Optional[np.ndarray] = None):
+        super().__init__()
+        self.q_image = q_image
+        self.buffer = buffer  # Keeps the pixels behind q_image alive
+        self.file_path = file_path
+        self.dpi = dpi
+        self.signals = SaveImageSignals()
+
+    def run(self):
+        try:
+            save_qimage(self.q_image, self.file_path, self.dpi)
+            error = None
+        except Exception as e:
+            error = str(e)
+        self.signals.finished.emit(self.file_path, error)
@@ -3,22 +3,128 @@ Preset management module for TEM Image Editor.
 Handles preset storage, loading, and the preset management dialog.
 """
 
+import bisect
+import hashlib
 import json
+import os
+import re
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
+# Try to import orjson for faster preset (de)serialization
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QHeaderView, QDialogButtonBox
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+    QHeaderView, QDialogButtonBox
 )
 
+_PRESET_FILE = Path(__file__).resolve().parent / "tem_presets.json"
+
+# Built-in presets; entries saved in the preset file override or extend these
+_DEFAULT_PRESETS: Dict[str, float] = {
+    "Standard": 35.6,
+    "Local Map": 80.5,
+    "Reference": 16.0,
+    "In focus": 32.9,
+    "High Res": 5.3,
+    "Custom": 1.0
+}
+
+
+def _format_value(value: float) -> str:
+    """Short display text for a preset value ("35.6", "100"), never lossy."""
+    text = format(value, 'g')
+    # 'g' keeps 6 significant digits; fall back if that would round the value
+    return text if float(text) == value else repr(value)
+
+
+# Plain decimal or exponent notation; anything matching is accepted by float()
+_NUMBER_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def _parse_value(text: str) -> Optional[float]:
+    """Parse a preset value typed in the table; None unless a positive number."""
+    text = text.strip()
+    if not _NUMBER_RE.fullmatch(text):
+        return None
+    value = float(text)
+    return value if value > 0 else None
+
+
+class PresetModel(QAbstractTableModel):
+    """Editable (name, nm per pixel) table over a plain list of rows.
+    
+    Cells are kept as the text the user typed and only parsed in
+    PresetManager.get_presets, so a half-edited value is not lost.
+    """
+    
+    HEADERS = ("Mode Name", "nm per pixel")
+    NEW_ROW = ("New Mode", "1.0")
+    
+    def __init__(self, items: List[Tuple[str, float]], parent=None):
+        super().__init__(parent)
+        self._rows: List[List[str]] = [[name, _format_value(value)] for name, value in items]
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole) and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        self._rows[index.row()][index.column()] = str(value)
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def insertRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        self.beginInsertRows(parent, row, row + count - 1)
+        self._rows[row:row] = [list(self.NEW_ROW) for _ in range(count)]
+        self.endInsertRows()
+        return True
+    
+    def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        if row < 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        self.endRemoveRows()
+        return True
+    
+    def rows(self) -> List[List[str]]:
+        """The (name, value) text of every row, in display order."""
+        return self._rows
+
 
 class PresetManager(QDialog):
     """Dialog for managing imaging mode presets."""
     
     def __init__(self, presets: Dict[str, float], parent=None):
         super().__init__(parent)
-        self.presets = presets.copy()
+        # The dialog never edits the caller's dict, only the table rows
+        self._initial_items = sorted(presets.items())
         self.setWindowTitle("Manage Presets")
         self.setModal(True)
         self.setup_ui()
@@ -27,12 +133,9 @@ class PresetManager(QDialog):
         layout = QVBoxLayout()
         
         # Table for presets
-        self.table = QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Mode Name", "nm per pixel"])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
+        self.table = QTableView()
         self.populate_table()
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         
         layout.addWidget(self.table)
         
@@ -59,80 +162,88 @@ class PresetManager(QDialog):
         self.resize(400, 300)
         
     def populate_table(self):
-        self.table.setRowCount(len(self.presets))
-        for row, (name, value) in enumerate(sorted(self.presets.items())):
-            name_item = QTableWidgetItem(name)
-            value_item = QTableWidgetItem(str(value))
-            self.table.setItem(row, 0, name_item)
-            self.table.setItem(row, 1, value_item)
+        self.model = PresetModel(self._initial_items, self)
+        self.table.setModel(self.model)
             
     def add_preset(self):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        self.table.setItem(row, 0, QTableWidgetItem("New Mode"))
-        self.table.setItem(row, 1, QTableWidgetItem("1.0"))
+        # Insert where the new row sorts, so the table stays in name order
+        # without re-sorting (rows renamed since opening may be out of order)
+        row = bisect.bisect(self.model.rows(), list(PresetModel.NEW_ROW))
+        self.model.insertRow(row)
+        self.table.selectRow(row)
         
     def remove_preset(self):
-        current_row = self.table.currentRow()
+        current_row = self.table.currentIndex().row()
         if current_row >= 0:
-            self.table.removeRow(current_row)
+            self.model.removeRow(current_row)
             
     def get_presets(self) -> Dict[str, float]:
         """Get the updated presets from the table."""
-        presets = {}
-        for row in range(self.table.rowCount()):
-            name_item = self.table.item(row, 0)
-            value_item = self.table.item(row, 1)
-            if name_item and value_item:
-                try:
-                    name = name_item.text().strip()
-                    value = float(value_item.text())
-                    if name and value > 0:
-                        presets[name] = value
-                except ValueError:
-                    pass
-        return presets
+        parsed = ((name.strip(), _parse_value(value)) for name, value in self.model.rows())
+        return {name: value for name, value in parsed if name and value is not None}
 
 
 class PresetStorage:
     """Handles loading and saving presets to disk."""
     
+    # Digest of the presets as last loaded or saved; save_presets skips the
+    # write when nothing changed (e.g. the dialog closed with OK untouched)
+    _last_hash: Optional[bytes] = None
+    
+    @staticmethod
+    def _serialize(presets: Dict[str, float]) -> bytes:
+        if HAS_ORJSON:
+            return orjson.dumps(presets, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        return json.dumps(presets, indent=2, sort_keys=True).encode('utf-8')
+    
+    @staticmethod
+    def _digest(payload: bytes) -> bytes:
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
     @staticmethod
     def get_preset_file() -> Path:
         """Get the path to the preset file."""
-        return Path(__file__).parent / "tem_presets.json"
+        return _PRESET_FILE
     
     @staticmethod
     def load_presets() -> Dict[str, float]:
         """Load presets from JSON file."""
         preset_file = PresetStorage.get_preset_file()
         
-        # Default presets
-        presets = {
-            "Standard": 35.6,
-            "Local Map": 80.5,
-            "Reference": 16.0,
-            "In focus": 32.9,
-            "High Res": 5.3,
-            "Custom": 1.0
-        }
+        presets = _DEFAULT_PRESETS.copy()
         
-        if preset_file.exists():
-            try:
-                with open(preset_file, 'r') as f:
-                    loaded_presets = json.load(f)
-                    presets.update(loaded_presets)
-            except Exception as e:
-                print(f"Error loading presets: {e}")
+        # A missing file just means no saved presets yet
+        try:
+            data = preset_file.read_bytes()
+            # Both parsers take bytes and detect the UTF encoding themselves
+            presets.update(orjson.loads(data) if HAS_ORJSON else json.loads(data))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            # Unreadable file, malformed JSON, or JSON that is not an object
+            print(f"Error loading presets: {e}")
         
+        # Hash what save_presets would write, since the file may lack the
+        # defaults merged in above
+        PresetStorage._last_hash = PresetStorage._digest(PresetStorage._serialize(presets))
         return presets
     
     @staticmethod
     def save_presets(presets: Dict[str, float]):
         """Save presets to JSON file."""
+        payload = PresetStorage._serialize(presets)
+        digest = PresetStorage._digest(payload)
+        if digest == PresetStorage._last_hash:
+            return
+        
         preset_file = PresetStorage.get_preset_file()
+        tmp_file = preset_file.with_name(preset_file.name + ".tmp")
         try:
-            with open(preset_file, 'w') as f:
-                json.dump(presets, f, indent=2)
-        except Exception as e:
+            # Write a sibling temp file and swap it in, so a crash mid-write
+            # never leaves a truncated preset file behind
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, preset_file)
+            PresetStorage._last_hash = digest
+        except OSError as e:
             print(f"Error saving presets: {e}")